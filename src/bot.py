@@ -6,13 +6,20 @@ Handles Telegram bot interactions, RSS monitoring, and lifecycle management.
 import asyncio
 import io
 import json
+import os
+import re
 import signal
-from datetime import datetime, time, timedelta, timezone as tz
+from collections import defaultdict
+from datetime import datetime, time, timezone as tz
+from functools import lru_cache, wraps
 from pathlib import Path
+from time import monotonic, time as unix_time
 from typing import Optional
 
+import orjson
 from telegram import Update, BotCommand, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
+    AIORateLimiter,
     Application,
     CommandHandler,
     ContextTypes,
@@ -22,37 +29,342 @@ from telegram.ext import (
     filters,
 )
 from telegram.constants import ParseMode, ChatType
-from telegram.error import TelegramError
-
-from .config import config, logger
-from .database import Database
-from .rss_monitor import RSSMonitor, StatusEvent
-
-# Common timezones for Brazil
-TIMEZONES = {
-    "UTC": 0,
-    "BRT": -3,      # Brasilia Time (most of Brazil)
-    "AMT": -4,      # Amazon Time
-    "ACT": -5,      # Acre Time
-    "FNT": -2,      # Fernando de Noronha Time
+from telegram.error import RetryAfter, TelegramError
+from telegram.request import HTTPXRequest
+
+from .config import HHMM_RE, TIMEZONES, config, logger
+from .database import ChatSub, Database
+from .rss_monitor import FeedStatus, RSSMonitor, StatusEvent
+
+# Sliding window for per-chat command rate limiting (seconds)
+RATE_LIMIT_WINDOW = 60
+
+# Interval between health check file updates (seconds)
+HEALTH_CHECK_INTERVAL = 30
+
+# Interval between command log flushes to the database (seconds)
+COMMAND_LOG_FLUSH_INTERVAL = 30
+
+# Interval between cleanups of old messages and command log (seconds)
+CLEANUP_INTERVAL = 3600
+
+# Max chats receiving the same event at the same time
+SEND_CONCURRENCY = 10
+
+# Max chats flushing their quiet hours digest at the same time
+PENDING_FLUSH_CONCURRENCY = 20
+
+# How long chat admin checks are cached (seconds) and max cache entries
+ADMIN_CACHE_TTL = 180
+ADMIN_CACHE_MAX_SIZE = 10000
+
+# Telegram delivery budgets (messages per second): overall and per chat
+GLOBAL_SEND_RATE = 30
+CHAT_SEND_RATE = 1
+
+# Times a send is retried after Telegram answers 429 (RetryAfter)
+MAX_SEND_RETRIES = 2
+
+# UTC offsets of the quiet hours TIMEZONES, in seconds
+_TZ_OFFSETS = {name: hours * 3600 for name, hours in TIMEZONES.items()}
+
+# Seconds in a day (quiet hours are compared as seconds since midnight)
+_DAY_SECONDS = 86400
+
+
+@lru_cache(maxsize=1500)
+def _parse_hhmm(value: str) -> int:
+    """
+    Parse an HH:MM string into seconds since midnight (cached, only 1440 valid values).
+
+    Raises:
+        ValueError: If the value is not a valid HH:MM time
+    """
+    match = HHMM_RE.match(value)
+    if match is None:
+        raise ValueError(f"Invalid HH:MM time: {value!r}")
+    return int(match.group(1)) * 3600 + int(match.group(2)) * 60
+
+
+class TokenBucket:
+    """Async token bucket: acquire() waits until a token is available."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Take one token, sleeping until the bucket has refilled if needed."""
+        async with self._lock:
+            now = monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self.last = monotonic()
+                self.tokens = 0
+            else:
+                self.tokens -= 1
+
+    def is_idle(self) -> bool:
+        """True if refilled to full and unused for a full refill period."""
+        idle_for = monotonic() - self.last
+        return (
+            not self._lock.locked()
+            and idle_for >= self.capacity / self.rate
+            and self.tokens + idle_for * self.rate >= self.capacity
+        )
+
+    def pause(self, seconds: float) -> None:
+        """Drain the bucket so no token is available for the given time."""
+        self.tokens = min(self.tokens, 0) - seconds * self.rate
+        self.last = monotonic()
+
+
+# Bot admins, fixed after config load
+_ADMIN_IDS: frozenset[int] = config.admin_ids
+
+
+def require_admin(func):
+    """Restrict a command handler to bot admins (replies otherwise)."""
+    @wraps(func)
+    async def wrapper(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        user = update.effective_user
+        if not user:
+            return
+
+        if user.id not in _ADMIN_IDS:
+            await update.message.reply_text(self._ADMIN_ONLY_MESSAGE)
+            logger.warning(f"Unauthorized {func.__name__} attempt: user={user.id} ({user.username})")
+            return
+
+        await func(self, update, context)
+    return wrapper
+
+
+# Quiet hours menu callback data:
+#   quiet:off | quiet:tz | quiet:back | quiet:tzsel:TZ
+#   quiet:TZ:HH:MM:HH:MM | quiet:set:TZ:HH:MM:HH:MM
+_QUIET_CB_RE = re.compile(
+    r"^quiet:(?:(off|tz|back)|tzsel:(\w+)|(?:set:)?(\w+):(\d{2}):(\d{2}):(\d{2}):(\d{2}))$"
+)
+
+# Delivery errors meaning the chat is permanently inaccessible
+_PERM_ERR_RE = re.compile(r"blocked|deactivated|not found|kicked|forbidden", re.IGNORECASE)
+
+# /stats reply, filled with format_map in cmd_stats
+_STATS_TEMPLATE = (
+    "<b>Estatisticas do Bot</b>\n"
+    "\n"
+    "<b>Chats:</b>\n"
+    "  Ativos: {active_chats}\n"
+    "\n"
+    "<b>Mensagens:</b>\n"
+    "  Total enviadas: {total_messages_sent}\n"
+    "  Falhas de entrega: {failed_deliveries}\n"
+    "\n"
+    "<b>RSS Feed:</b>\n"
+    "  Status: {feed_status}\n"
+    "  Entradas no feed: {total_entries}\n"
+    "  Falhas consecutivas: {consecutive_failures}\n"
+    "\n"
+    "<b>Configuracao:</b>\n"
+    "  Intervalo de check: {check_interval}s\n"
+    "  Idade max eventos: {max_message_age_days} dias\n"
+    "  Rate limit: {rate_limit_commands}/min\n"
+    "  Admins: {admin_count}"
+)
+
+# Backup uploads handled by handle_backup_file
+_BACKUP_FILE_FILTER = filters.Document.MimeType("application/json")
+
+# Static inline keyboards for the quiet hours menu (built once, reused per call)
+_MAIN_QUIET_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("22:00 - 07:00 (BRT)", callback_data="quiet:BRT:22:00:07:00"),
+        InlineKeyboardButton("23:00 - 08:00 (BRT)", callback_data="quiet:BRT:23:00:08:00"),
+    ],
+    [
+        InlineKeyboardButton("00:00 - 06:00 (BRT)", callback_data="quiet:BRT:00:00:06:00"),
+        InlineKeyboardButton("21:00 - 06:00 (BRT)", callback_data="quiet:BRT:21:00:06:00"),
+    ],
+    [InlineKeyboardButton("Selecionar timezone", callback_data="quiet:tz")],
+    [InlineKeyboardButton("Desativar", callback_data="quiet:off")],
+])
+
+# (timezone, button label) pairs, e.g. ("BRT", "BRT (UTC-3)")
+_TZ_BUTTONS: tuple[tuple[str, str], ...] = tuple(
+    (name, f"{name} (UTC{'+' if offset >= 0 else ''}{offset})")
+    for name, offset in TIMEZONES.items()
+)
+
+_TZ_QUIET_KEYBOARD = InlineKeyboardMarkup(
+    [
+        [InlineKeyboardButton(label, callback_data=f"quiet:tzsel:{name}")]
+        for name, label in _TZ_BUTTONS
+    ]
+    + [[InlineKeyboardButton("Voltar", callback_data="quiet:back")]]
+)
+
+_TZSEL_QUIET_KEYBOARDS: dict[str, InlineKeyboardMarkup] = {
+    name: InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton("22:00 - 07:00", callback_data=f"quiet:set:{name}:22:00:07:00"),
+            InlineKeyboardButton("23:00 - 08:00", callback_data=f"quiet:set:{name}:23:00:08:00"),
+        ],
+        [
+            InlineKeyboardButton("00:00 - 06:00", callback_data=f"quiet:set:{name}:00:00:06:00"),
+            InlineKeyboardButton("21:00 - 06:00", callback_data=f"quiet:set:{name}:21:00:06:00"),
+        ],
+        [InlineKeyboardButton("Voltar", callback_data="quiet:tz")],
+    ])
+    for name in TIMEZONES
 }
 
 
 class IXBRBot:
     """Main bot class handling Telegram interactions and RSS monitoring."""
 
+    # (command, handler method, block). Read-only commands use block=False so
+    # PTB runs them concurrently instead of serializing updates; commands that
+    # write (including /silencio) block, so their writes apply in order.
+    _HANDLER_SPECS: tuple[tuple[str, str, bool], ...] = (
+        ("start", "cmd_start", True),
+        ("stop", "cmd_stop", True),
+        ("status", "cmd_status", False),
+        ("help", "cmd_help", False),
+        ("silencio", "cmd_quiet_hours", True),
+        # Admin commands (not visible to users, only admins)
+        ("backup", "cmd_backup", True),
+        ("restore", "cmd_restore", True),
+        ("stats", "cmd_stats", True),
+    )
+
+    # ==================== Static Messages ====================
+
+    _START_NEW_MESSAGE = (
+        "<b>Inscricao ativada!</b>\n\n"
+        "Este chat agora recebera notificacoes de:\n"
+        "- Incidentes e problemas\n"
+        "- Janelas de manutencao programadas\n"
+        "- Resolucoes de problemas\n\n"
+        "Fonte: <a href=\"https://status.ix.br\">status.ix.br</a>\n\n"
+        "Use /silencio para configurar horario de silencio.\n"
+        "Use /stop para desativar as notificacoes.\n"
+        "Use /help para mais informacoes."
+    )
+
+    _START_ALREADY_MESSAGE = (
+        "Este chat ja esta inscrito para receber notificacoes.\n\n"
+        "Use /stop para desativar as notificacoes.\n"
+        "Use /help para mais informacoes."
+    )
+
+    _STOP_OK_MESSAGE = (
+        "<b>Inscricao desativada!</b>\n\n"
+        "Este chat nao recebera mais notificacoes do IX.br.\n\n"
+        "Use /start para reativar as notificacoes."
+    )
+
+    _STOP_NOT_SUB_MESSAGE = (
+        "Este chat nao estava inscrito.\n\n"
+        "Use /start para ativar as notificacoes."
+    )
+
+    _HELP_MESSAGE_PUBLIC = (
+        "<b>IX.br Status Bot</b>\n\n"
+        "Este bot envia notificacoes sobre o status do IX.br "
+        "(PTT - Ponto de Troca de Trafego brasileiro).\n\n"
+        "<b>Comandos disponiveis:</b>\n"
+        "/start - Ativar notificacoes neste chat\n"
+        "/stop - Desativar notificacoes\n"
+        "/status - Verificar status do bot e do feed\n"
+        "/silencio - Configurar horario de silencio\n"
+        "/help - Mostrar esta mensagem\n\n"
+        "<b>Tipos de notificacoes:</b>\n"
+        "- Incidentes e problemas\n"
+        "- Manutencoes programadas\n"
+        "- Problemas resolvidos\n\n"
+        "<b>Horario de silencio:</b>\n"
+        "Use /silencio 22:00 07:00 para nao receber "
+        "notificacoes durante a noite.\n\n"
+        "<b>Links uteis:</b>\n"
+        "- Pagina de Status: https://status.ix.br\n"
+        "- Site oficial: https://ix.br\n\n"
+        "<i>Desenvolvido para a comunidade de redes brasileira</i>"
+    )
+
+    _HELP_MESSAGE_ADMIN_SUFFIX = (
+        "\n\n<b>Comandos de admin:</b>\n"
+        "/backup - Exportar backup dos chats\n"
+        "/restore - Restaurar backup (envie o arquivo)\n"
+        "/stats - Estatisticas detalhadas"
+    )
+
+    _RATE_LIMIT_MESSAGE = "Muitos comandos em pouco tempo. Aguarde um momento."
+
+    _ADMIN_ONLY_MESSAGE = "Este comando e restrito a administradores."
+
     def __init__(self):
         """Initialize the bot with database and RSS monitor."""
-        # Initialize components
+        # Initialize components. The database runs in WAL mode (see
+        # database.CONNECTION_PRAGMAS), which backup/restore rely on to run
+        # concurrently with user commands.
         self.db = Database()
         self.rss_monitor = RSSMonitor()
         self._shutdown_event = asyncio.Event()
         self._health_check_task: Optional[asyncio.Task] = None
 
-        # Build the Telegram application
+        # (chat_id, user_id) -> (is_admin, expiry) for chat admin checks
+        self._admin_cache: dict[tuple[int, int], tuple[bool, float]] = {}
+        self._private_chats: set[int] = set()
+
+        # Active chats reused across RSS ticks; refreshed after any
+        # subscription or quiet hours change marks the cache dirty
+        self._active_chats_cache: Optional[list[ChatSub]] = None
+        self._active_chats_dirty = True
+
+        # Malformed stored quiet hours already warned about (start, end)
+        self._invalid_quiet_hours: set[tuple] = set()
+
+        # Outgoing notification throttling (replaces fixed sleeps between sends)
+        self._global_bucket = TokenBucket(GLOBAL_SEND_RATE, GLOBAL_SEND_RATE)
+        self._chat_buckets: defaultdict[int, TokenBucket] = defaultdict(
+            lambda: TokenBucket(CHAT_SEND_RATE, CHAT_SEND_RATE)
+        )
+
+        # Build the Telegram application with one persistent HTTP/2 client,
+        # sized for bursts of outgoing calls (replies, edits, fan-out)
+        request = HTTPXRequest(
+            connection_pool_size=256,
+            http_version="2",
+            pool_timeout=5.0,
+            connect_timeout=5.0,
+            read_timeout=20.0,
+        )
+        # getUpdates is a single long-poll at a time
+        get_updates_request = HTTPXRequest(
+            connection_pool_size=1,
+            http_version="2",
+        )
         self.app = (
             Application.builder()
             .token(config.telegram_bot_token)
+            .request(request)
+            .get_updates_request(get_updates_request)
+            # Throttle all outgoing calls to Telegram's limits (30/s overall,
+            # 20/min per group) and retry automatically on 429
+            .rate_limiter(AIORateLimiter(
+                overall_max_rate=30,
+                overall_time_period=1,
+                group_max_rate=20,
+                group_time_period=60,
+                max_retries=3,
+            ))
             .build()
         )
 
@@ -66,20 +378,10 @@ class IXBRBot:
 
     def _register_handlers(self) -> None:
         """Register all command handlers."""
-        handlers = [
-            CommandHandler("start", self.cmd_start),
-            CommandHandler("stop", self.cmd_stop),
-            CommandHandler("status", self.cmd_status),
-            CommandHandler("help", self.cmd_help),
-            CommandHandler("silencio", self.cmd_quiet_hours),
-            # Admin commands (not visible to users, only admins)
-            CommandHandler("backup", self.cmd_backup),
-            CommandHandler("restore", self.cmd_restore),
-            CommandHandler("stats", self.cmd_stats),
-        ]
-
-        for handler in handlers:
-            self.app.add_handler(handler)
+        for name, attr, block in self._HANDLER_SPECS:
+            self.app.add_handler(
+                CommandHandler(name, getattr(self, attr), block=block)
+            )
 
         # Callback handler for inline keyboard menus
         self.app.add_handler(
@@ -88,10 +390,7 @@ class IXBRBot:
 
         # Handler for receiving backup files
         self.app.add_handler(
-            MessageHandler(
-                filters.Document.MimeType("application/json"),
-                self.handle_backup_file
-            )
+            MessageHandler(_BACKUP_FILE_FILTER, self.handle_backup_file)
         )
 
         self.app.add_error_handler(self.error_handler)
@@ -128,37 +427,61 @@ class IXBRBot:
         """
         Check if a user is an administrator of the chat.
         Returns True for private chats (user is always "admin" of their own chat).
+        Results are cached for ADMIN_CACHE_TTL seconds to avoid repeated API calls.
         """
+        if chat_id in self._private_chats:
+            return True
+
+        key = (chat_id, user_id)
+        now = monotonic()
+        cached = self._admin_cache.get(key)
+        if cached and now < cached[1]:
+            return cached[0]
+
         try:
             chat = await self.app.bot.get_chat(chat_id)
 
             # Private chats - user is always allowed
             if chat.type == ChatType.PRIVATE:
+                self._private_chats.add(chat_id)
                 return True
 
             # For groups/supergroups/channels, check admin status
             member = await self.app.bot.get_chat_member(chat_id, user_id)
-            return member.status in ["creator", "administrator"]
+            is_admin = member.status in ["creator", "administrator"]
 
         except TelegramError as e:
             logger.warning(f"Could not check admin status: chat={chat_id} user={user_id} error={e}")
-            # Default to False for safety
+            # Default to False for safety (not cached, so it is retried next time)
             return False
 
+        if len(self._admin_cache) >= ADMIN_CACHE_MAX_SIZE:
+            # Drop expired entries; start over if everything is still fresh
+            self._admin_cache = {
+                k: v for k, v in self._admin_cache.items() if now < v[1]
+            }
+            if len(self._admin_cache) >= ADMIN_CACHE_MAX_SIZE:
+                self._admin_cache.clear()
+
+        self._admin_cache[key] = (is_admin, now + ADMIN_CACHE_TTL)
+        return is_admin
+
     # ==================== Rate Limiting ====================
 
     async def _check_rate_limit(self, chat_id: int, command: str) -> bool:
         """
         Check if a command should be rate limited.
         Returns True if command is allowed, False if rate limited.
-        """
-        count = await self.db.get_command_count(chat_id, seconds=60)
 
-        if count >= config.rate_limit_commands:
-            logger.warning(f"Rate limit exceeded: chat={chat_id} cmd={command} count={count}")
+        The decision is made from the in-memory command window kept by the
+        database; the command log itself is only written for auditing, in
+        periodic batches.
+        """
+        if not await self.db.check_and_log_command(
+            chat_id, command, RATE_LIMIT_WINDOW, config.rate_limit_commands
+        ):
+            logger.warning(f"Rate limit exceeded: chat={chat_id} cmd={command}")
             return False
-
-        await self.db.log_command(chat_id, command)
         return True
 
     # ==================== Quiet Hours ====================
@@ -167,7 +490,8 @@ class IXBRBot:
         self,
         quiet_start: Optional[str],
         quiet_end: Optional[str],
-        quiet_tz: Optional[str] = "UTC"
+        quiet_tz: Optional[str] = "UTC",
+        now_ts: Optional[float] = None
     ) -> bool:
         """
         Check if current time is within quiet hours.
@@ -176,6 +500,7 @@ class IXBRBot:
             quiet_start: Start time in HH:MM format
             quiet_end: End time in HH:MM format
             quiet_tz: Timezone string (e.g., "BRT", "UTC")
+            now_ts: Current Unix time; read from the clock if not given
 
         Returns:
             True if currently in quiet hours
@@ -183,19 +508,23 @@ class IXBRBot:
         if not quiet_start or not quiet_end:
             return False
 
-        # Get UTC offset from timezone
-        tz_offset = TIMEZONES.get(quiet_tz or "UTC", 0)
+        if now_ts is None:
+            now_ts = unix_time()
 
-        # Get current time in UTC, then apply offset
-        now_utc = datetime.now(tz.utc)
-        offset_delta = now_utc + timedelta(hours=tz_offset)
-        now = offset_delta.time()
+        # Current wall-clock time in the chat's timezone (seconds since midnight)
+        now = (now_ts + _TZ_OFFSETS.get(quiet_tz or "UTC", 0)) % _DAY_SECONDS
 
-        start_parts = quiet_start.split(":")
-        end_parts = quiet_end.split(":")
-
-        start = time(int(start_parts[0]), int(start_parts[1]))
-        end = time(int(end_parts[0]), int(end_parts[1]))
+        try:
+            start = _parse_hhmm(quiet_start)
+            end = _parse_hhmm(quiet_end)
+        except (ValueError, TypeError):
+            # A bad stored value must not break the tick for every chat;
+            # the chat is treated as not quiet
+            key = (quiet_start, quiet_end)
+            if key not in self._invalid_quiet_hours:
+                self._invalid_quiet_hours.add(key)
+                logger.warning(f"Invalid quiet hours ignored: {quiet_start!r}-{quiet_end!r}")
+            return False
 
         # Handle overnight quiet hours (e.g., 22:00 to 07:00)
         if start > end:
@@ -227,9 +556,7 @@ class IXBRBot:
 
         # Rate limiting
         if not await self._check_rate_limit(chat.id, "start"):
-            await update.message.reply_text(
-                "Muitos comandos em pouco tempo. Aguarde um momento."
-            )
+            await update.message.reply_text(self._RATE_LIMIT_MESSAGE)
             return
 
         chat_title = chat.title or chat.full_name or f"Chat {chat.id}"
@@ -239,25 +566,9 @@ class IXBRBot:
             chat_type=chat.type,
             chat_title=chat_title
         )
+        self._active_chats_dirty = True
 
-        if is_new:
-            message = (
-                "<b>Inscricao ativada!</b>\n\n"
-                "Este chat agora recebera notificacoes de:\n"
-                "- Incidentes e problemas\n"
-                "- Janelas de manutencao programadas\n"
-                "- Resolucoes de problemas\n\n"
-                "Fonte: <a href=\"https://status.ix.br\">status.ix.br</a>\n\n"
-                "Use /silencio para configurar horario de silencio.\n"
-                "Use /stop para desativar as notificacoes.\n"
-                "Use /help para mais informacoes."
-            )
-        else:
-            message = (
-                "Este chat ja esta inscrito para receber notificacoes.\n\n"
-                "Use /stop para desativar as notificacoes.\n"
-                "Use /help para mais informacoes."
-            )
+        message = self._START_NEW_MESSAGE if is_new else self._START_ALREADY_MESSAGE
 
         await update.message.reply_text(
             message,
@@ -289,24 +600,13 @@ class IXBRBot:
                 return
 
         if not await self._check_rate_limit(chat.id, "stop"):
-            await update.message.reply_text(
-                "Muitos comandos em pouco tempo. Aguarde um momento."
-            )
+            await update.message.reply_text(self._RATE_LIMIT_MESSAGE)
             return
 
         was_subscribed = await self.db.unsubscribe_chat(chat.id)
+        self._active_chats_dirty = True
 
-        if was_subscribed:
-            message = (
-                "<b>Inscricao desativada!</b>\n\n"
-                "Este chat nao recebera mais notificacoes do IX.br.\n\n"
-                "Use /start para reativar as notificacoes."
-            )
-        else:
-            message = (
-                "Este chat nao estava inscrito.\n\n"
-                "Use /start para ativar as notificacoes."
-            )
+        message = self._STOP_OK_MESSAGE if was_subscribed else self._STOP_NOT_SUB_MESSAGE
 
         await update.message.reply_text(message, parse_mode=ParseMode.HTML)
 
@@ -325,54 +625,64 @@ class IXBRBot:
             return
 
         if not await self._check_rate_limit(chat.id, "status"):
-            await update.message.reply_text(
-                "Muitos comandos em pouco tempo. Aguarde um momento."
-            )
+            await update.message.reply_text(self._RATE_LIMIT_MESSAGE)
             return
 
         checking_msg = await update.message.reply_text("Verificando status...")
 
-        feed_status = self.rss_monitor.check_feed_status()
+        feed_status = await self.rss_monitor.check_feed_status()
+        is_subscribed = await self.db.is_chat_subscribed(chat.id)
+        quiet = await self.db.get_chat_quiet_hours(chat.id)
 
-        lines = ["<b>Status do Bot</b>", ""]
-        lines.append("Bot: <b>Online</b>")
+        await checking_msg.edit_text(
+            self._format_status(feed_status, is_subscribed, quiet),
+            parse_mode=ParseMode.HTML
+        )
 
-        if feed_status["reachable"]:
-            lines.append("Feed RSS (status.ix.br): <b>Acessivel</b>")
+    @staticmethod
+    def _format_status(
+        feed_status: FeedStatus,
+        is_subscribed: bool,
+        quiet: Optional[tuple]
+    ) -> str:
+        """Build the /status message from feed and chat state."""
+        if feed_status.reachable:
+            feed_line = "Feed RSS (status.ix.br): <b>Acessivel</b>"
+        elif feed_status.error:
+            feed_line = (
+                "Feed RSS (status.ix.br): <b>Inacessivel</b>\n"
+                f"  Erro: {feed_status.error[:100]}"
+            )
         else:
-            lines.append("Feed RSS (status.ix.br): <b>Inacessivel</b>")
-            if feed_status["error"]:
-                lines.append(f"  Erro: {feed_status['error'][:100]}")
+            feed_line = "Feed RSS (status.ix.br): <b>Inacessivel</b>"
 
-        lines.append("")
-
-        if feed_status["last_post_date"]:
-            date_str = feed_status["last_post_date"].strftime("%d/%m/%Y as %H:%M")
-            lines.append(f"<b>Ultimo post:</b> {date_str}")
-            if feed_status["last_post_title"]:
-                title = feed_status["last_post_title"]
+        last_post_date = feed_status.last_post_date
+        if last_post_date:
+            post_block = f"<b>Ultimo post:</b> {last_post_date.strftime('%d/%m/%Y as %H:%M')}"
+            title = feed_status.last_post_title
+            if title:
                 if len(title) > 60:
                     title = title[:60] + "..."
-                lines.append(f"<i>{title}</i>")
+                post_block += f"\n<i>{title}</i>"
         else:
-            lines.append("Ultimo post: <i>Nao disponivel</i>")
-
-        lines.append("")
+            post_block = "Ultimo post: <i>Nao disponivel</i>"
 
-        is_subscribed = await self.db.is_chat_subscribed(chat.id)
         sub_status = "Inscrito" if is_subscribed else "Nao inscrito"
-        lines.append(f"Este chat: <b>{sub_status}</b>")
 
         # Show quiet hours if configured
-        quiet = await self.db.get_chat_quiet_hours(chat.id)
+        quiet_line = ""
         if quiet:
             tz_info = f" ({quiet[2]})" if len(quiet) > 2 and quiet[2] else ""
-            lines.append(f"Horario de silencio: {quiet[0]} - {quiet[1]}{tz_info}")
+            quiet_line = f"\nHorario de silencio: {quiet[0]} - {quiet[1]}{tz_info}"
 
-        await checking_msg.edit_text(
-            "\n".join(lines),
-            parse_mode=ParseMode.HTML
-        )
+        return f"""<b>Status do Bot</b>
+
+Bot: <b>Online</b>
+{feed_line}
+
+{post_block}
+
+Este chat: <b>{sub_status}</b>{quiet_line}"""
 
     async def cmd_quiet_hours(
         self,
@@ -392,9 +702,7 @@ class IXBRBot:
             return
 
         if not await self._check_rate_limit(chat.id, "silencio"):
-            await update.message.reply_text(
-                "Muitos comandos em pouco tempo. Aguarde um momento."
-            )
+            await update.message.reply_text(self._RATE_LIMIT_MESSAGE)
             return
 
         args = context.args or []
@@ -412,37 +720,20 @@ class IXBRBot:
             else:
                 current_text = "<b>Horario de silencio: Desativado</b>\n\n"
 
-            keyboard = [
-                [
-                    InlineKeyboardButton("22:00 - 07:00 (BRT)", callback_data="quiet:BRT:22:00:07:00"),
-                    InlineKeyboardButton("23:00 - 08:00 (BRT)", callback_data="quiet:BRT:23:00:08:00"),
-                ],
-                [
-                    InlineKeyboardButton("00:00 - 06:00 (BRT)", callback_data="quiet:BRT:00:00:06:00"),
-                    InlineKeyboardButton("21:00 - 06:00 (BRT)", callback_data="quiet:BRT:21:00:06:00"),
-                ],
-                [
-                    InlineKeyboardButton("Selecionar timezone", callback_data="quiet:tz"),
-                ],
-                [
-                    InlineKeyboardButton("Desativar", callback_data="quiet:off"),
-                ],
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-
             await update.message.reply_text(
                 current_text +
                 "Selecione uma opcao ou configure manualmente:\n"
                 "<code>/silencio HH:MM HH:MM</code> (UTC)\n"
                 "<code>/silencio BRT 22:00 07:00</code> (com timezone)",
                 parse_mode=ParseMode.HTML,
-                reply_markup=reply_markup
+                reply_markup=_MAIN_QUIET_KEYBOARD
             )
             return
 
         # Disable quiet hours
         if args[0].lower() == "off":
             await self.db.set_quiet_hours(chat.id, None, None, None)
+            self._active_chats_dirty = True
             await update.message.reply_text(
                 "Horario de silencio desativado.\n"
                 "Notificacoes serao enviadas imediatamente."
@@ -473,21 +764,14 @@ class IXBRBot:
             return
 
         # Validate time format
-        try:
-            for t in [start, end]:
-                parts = t.split(":")
-                if len(parts) != 2:
-                    raise ValueError()
-                h, m = int(parts[0]), int(parts[1])
-                if not (0 <= h <= 23 and 0 <= m <= 59):
-                    raise ValueError()
-        except ValueError:
+        if not HHMM_RE.match(start) or not HHMM_RE.match(end):
             await update.message.reply_text(
                 "Formato invalido. Use HH:MM (ex: 22:00)"
             )
             return
 
         await self.db.set_quiet_hours(chat.id, start, end, timezone_str)
+        self._active_chats_dirty = True
         await update.message.reply_text(
             f"Horario de silencio configurado!\n\n"
             f"Inicio: {start}\n"
@@ -512,10 +796,23 @@ class IXBRBot:
         await query.answer()
 
         chat_id = query.message.chat_id
-        data = query.data
 
-        if data == "quiet:off":
+        match = _QUIET_CB_RE.match(query.data)
+        if not match:
+            return
+
+        action, tzsel = match.group(1), match.group(2)
+
+        # Menu selections that change the settings count as a /silencio
+        # command for rate limiting, like the command itself
+        writes = action == "off" or match.group(3) is not None
+        if writes and not await self._check_rate_limit(chat_id, "silencio"):
+            await query.edit_message_text(self._RATE_LIMIT_MESSAGE)
+            return
+
+        if action == "off":
             await self.db.set_quiet_hours(chat_id, None, None, None)
+            self._active_chats_dirty = True
             await query.edit_message_text(
                 "Horario de silencio desativado.\n"
                 "Notificacoes serao enviadas imediatamente."
@@ -523,15 +820,8 @@ class IXBRBot:
             logger.info(f"Quiet hours disabled via menu: chat={chat_id}")
             return
 
-        if data == "quiet:tz":
+        if action == "tz":
             # Show timezone selection
-            keyboard = [
-                [InlineKeyboardButton(f"{tz} (UTC{'+' if TIMEZONES[tz] >= 0 else ''}{TIMEZONES[tz]})",
-                                      callback_data=f"quiet:tzsel:{tz}")]
-                for tz in TIMEZONES.keys()
-            ]
-            keyboard.append([InlineKeyboardButton("Voltar", callback_data="quiet:back")])
-
             await query.edit_message_text(
                 "<b>Selecione o timezone:</b>\n\n"
                 "BRT = Brasilia (a maioria do Brasil)\n"
@@ -539,36 +829,27 @@ class IXBRBot:
                 "ACT = Acre\n"
                 "FNT = Fernando de Noronha",
                 parse_mode=ParseMode.HTML,
-                reply_markup=InlineKeyboardMarkup(keyboard)
+                reply_markup=_TZ_QUIET_KEYBOARD
             )
             return
 
-        if data.startswith("quiet:tzsel:"):
+        if tzsel:
             # Store selected timezone, show time selection
-            timezone_str = data.split(":")[2]
+            timezone_str = tzsel
+            reply_markup = _TZSEL_QUIET_KEYBOARDS.get(timezone_str)
+            if reply_markup is None:
+                return
             context.user_data["quiet_tz"] = timezone_str
 
-            keyboard = [
-                [
-                    InlineKeyboardButton("22:00 - 07:00", callback_data=f"quiet:set:{timezone_str}:22:00:07:00"),
-                    InlineKeyboardButton("23:00 - 08:00", callback_data=f"quiet:set:{timezone_str}:23:00:08:00"),
-                ],
-                [
-                    InlineKeyboardButton("00:00 - 06:00", callback_data=f"quiet:set:{timezone_str}:00:00:06:00"),
-                    InlineKeyboardButton("21:00 - 06:00", callback_data=f"quiet:set:{timezone_str}:21:00:06:00"),
-                ],
-                [InlineKeyboardButton("Voltar", callback_data="quiet:tz")],
-            ]
-
             await query.edit_message_text(
                 f"<b>Timezone: {timezone_str}</b>\n\n"
                 f"Selecione o horario de silencio:",
                 parse_mode=ParseMode.HTML,
-                reply_markup=InlineKeyboardMarkup(keyboard)
+                reply_markup=reply_markup
             )
             return
 
-        if data == "quiet:back":
+        if action == "back":
             # Back to main menu - re-invoke command
             quiet = await self.db.get_chat_quiet_hours(chat_id)
 
@@ -581,48 +862,33 @@ class IXBRBot:
             else:
                 current_text = "<b>Horario de silencio: Desativado</b>\n\n"
 
-            keyboard = [
-                [
-                    InlineKeyboardButton("22:00 - 07:00 (BRT)", callback_data="quiet:BRT:22:00:07:00"),
-                    InlineKeyboardButton("23:00 - 08:00 (BRT)", callback_data="quiet:BRT:23:00:08:00"),
-                ],
-                [
-                    InlineKeyboardButton("00:00 - 06:00 (BRT)", callback_data="quiet:BRT:00:00:06:00"),
-                    InlineKeyboardButton("21:00 - 06:00 (BRT)", callback_data="quiet:BRT:21:00:06:00"),
-                ],
-                [InlineKeyboardButton("Selecionar timezone", callback_data="quiet:tz")],
-                [InlineKeyboardButton("Desativar", callback_data="quiet:off")],
-            ]
-
             await query.edit_message_text(
                 current_text +
                 "Selecione uma opcao ou configure manualmente:\n"
                 "<code>/silencio HH:MM HH:MM</code> (UTC)\n"
                 "<code>/silencio BRT 22:00 07:00</code> (com timezone)",
                 parse_mode=ParseMode.HTML,
-                reply_markup=InlineKeyboardMarkup(keyboard)
+                reply_markup=_MAIN_QUIET_KEYBOARD
             )
             return
 
-        # Handle direct selection: quiet:TZ:HH:MM:HH:MM or quiet:set:TZ:HH:MM:HH:MM
-        parts = data.split(":")
-        if len(parts) >= 5:
-            if parts[1] == "set":
-                timezone_str, start, end = parts[2], f"{parts[3]}:{parts[4]}", f"{parts[5]}:{parts[6]}"
-            else:
-                timezone_str, start, end = parts[1], f"{parts[2]}:{parts[3]}", f"{parts[4]}:{parts[5]}"
+        # Direct selection: quiet:TZ:HH:MM:HH:MM or quiet:set:TZ:HH:MM:HH:MM
+        timezone_str = match.group(3)
+        start = f"{match.group(4)}:{match.group(5)}"
+        end = f"{match.group(6)}:{match.group(7)}"
 
-            await self.db.set_quiet_hours(chat_id, start, end, timezone_str)
-            await query.edit_message_text(
-                f"<b>Horario de silencio configurado!</b>\n\n"
-                f"Inicio: {start}\n"
-                f"Fim: {end}\n"
-                f"Timezone: {timezone_str}\n\n"
-                f"Durante este periodo, notificacoes serao acumuladas e "
-                f"enviadas em resumo quando o silencio terminar.",
-                parse_mode=ParseMode.HTML
-            )
-            logger.info(f"Quiet hours set via menu: chat={chat_id} {start}-{end} ({timezone_str})")
+        await self.db.set_quiet_hours(chat_id, start, end, timezone_str)
+        self._active_chats_dirty = True
+        await query.edit_message_text(
+            f"<b>Horario de silencio configurado!</b>\n\n"
+            f"Inicio: {start}\n"
+            f"Fim: {end}\n"
+            f"Timezone: {timezone_str}\n\n"
+            f"Durante este periodo, notificacoes serao acumuladas e "
+            f"enviadas em resumo quando o silencio terminar.",
+            parse_mode=ParseMode.HTML
+        )
+        logger.info(f"Quiet hours set via menu: chat={chat_id} {start}-{end} ({timezone_str})")
 
     async def cmd_help(
         self,
@@ -639,37 +905,10 @@ class IXBRBot:
         if not await self._check_rate_limit(chat.id, "help"):
             return
 
-        message = (
-            "<b>IX.br Status Bot</b>\n\n"
-            "Este bot envia notificacoes sobre o status do IX.br "
-            "(PTT - Ponto de Troca de Trafego brasileiro).\n\n"
-            "<b>Comandos disponiveis:</b>\n"
-            "/start - Ativar notificacoes neste chat\n"
-            "/stop - Desativar notificacoes\n"
-            "/status - Verificar status do bot e do feed\n"
-            "/silencio - Configurar horario de silencio\n"
-            "/help - Mostrar esta mensagem\n\n"
-            "<b>Tipos de notificacoes:</b>\n"
-            "- Incidentes e problemas\n"
-            "- Manutencoes programadas\n"
-            "- Problemas resolvidos\n\n"
-            "<b>Horario de silencio:</b>\n"
-            "Use /silencio 22:00 07:00 para nao receber "
-            "notificacoes durante a noite.\n\n"
-            "<b>Links uteis:</b>\n"
-            "- Pagina de Status: https://status.ix.br\n"
-            "- Site oficial: https://ix.br\n\n"
-            "<i>Desenvolvido para a comunidade de redes brasileira</i>"
-        )
-
         # Add admin commands info for admins
-        if user and config.is_admin(user.id):
-            message += (
-                "\n\n<b>Comandos de admin:</b>\n"
-                "/backup - Exportar backup dos chats\n"
-                "/restore - Restaurar backup (envie o arquivo)\n"
-                "/stats - Estatisticas detalhadas"
-            )
+        message = self._HELP_MESSAGE_PUBLIC + (
+            self._HELP_MESSAGE_ADMIN_SUFFIX if user and user.id in _ADMIN_IDS else ""
+        )
 
         await update.message.reply_text(
             message,
@@ -679,6 +918,7 @@ class IXBRBot:
 
     # ==================== Admin Commands ====================
 
+    @require_admin
     async def cmd_backup(
         self,
         update: Update,
@@ -691,25 +931,17 @@ class IXBRBot:
         if not user or not chat:
             return
 
-        if not config.is_admin(user.id):
-            await update.message.reply_text(
-                "Este comando e restrito a administradores."
-            )
-            logger.warning(f"Unauthorized backup attempt: user={user.id} ({user.username})")
-            return
-
         await update.message.reply_text("Gerando backup...")
 
         try:
             # Export data
             backup_data = await self.db.export_backup()
 
-            # Create JSON file
-            json_str = json.dumps(backup_data, indent=2, ensure_ascii=False)
-            json_bytes = json_str.encode("utf-8")
+            # Create JSON file (orjson returns UTF-8 bytes directly)
+            json_bytes = orjson.dumps(backup_data, option=orjson.OPT_INDENT_2)
 
             # Generate filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = datetime.now(tz.utc).strftime("%Y%m%d_%H%M%S")
             filename = f"ixbr_bot_backup_{timestamp}.json"
 
             # Send as document
@@ -732,23 +964,13 @@ class IXBRBot:
                 f"Erro ao gerar backup: {str(e)}"
             )
 
+    @require_admin
     async def cmd_restore(
         self,
         update: Update,
         context: ContextTypes.DEFAULT_TYPE
     ) -> None:
         """Handle /restore command - Show restore instructions (admin only)."""
-        user = update.effective_user
-
-        if not user:
-            return
-
-        if not config.is_admin(user.id):
-            await update.message.reply_text(
-                "Este comando e restrito a administradores."
-            )
-            return
-
         # Check for merge flag
         args = context.args or []
         if args and args[0] == "replace":
@@ -780,7 +1002,7 @@ class IXBRBot:
         if not user or not message or not message.document:
             return
 
-        if not config.is_admin(user.id):
+        if user.id not in _ADMIN_IDS:
             # Ignore files from non-admins
             return
 
@@ -799,12 +1021,13 @@ class IXBRBot:
         await message.reply_text("Processando arquivo de backup...")
 
         try:
-            # Download file
+            # Download file into a single in-memory buffer
             file = await message.document.get_file()
-            file_bytes = await file.download_as_bytearray()
+            buffer = io.BytesIO()
+            await file.download_to_memory(out=buffer)
 
-            # Parse JSON
-            backup_data = json.loads(file_bytes.decode("utf-8"))
+            # Parse JSON straight from the buffer, without an extra copy
+            backup_data = orjson.loads(buffer.getbuffer())
 
             # Validate
             if "subscribed_chats" not in backup_data:
@@ -819,6 +1042,7 @@ class IXBRBot:
 
             # Do the import
             result = await self.db.import_backup(backup_data, merge=merge)
+            self._active_chats_dirty = True
 
             await message.reply_text(
                 f"<b>Restauracao concluida!</b>\n\n"
@@ -841,55 +1065,33 @@ class IXBRBot:
             logger.error(f"Restore failed: admin={user.id} error={e}")
             await message.reply_text(f"Erro ao restaurar: {str(e)}")
 
+    @require_admin
     async def cmd_stats(
         self,
         update: Update,
         context: ContextTypes.DEFAULT_TYPE
     ) -> None:
         """Handle /stats command - Show detailed statistics (admin only)."""
-        user = update.effective_user
-        chat = update.effective_chat
-
-        if not user or not chat:
-            return
-
-        if not config.is_admin(user.id):
-            await update.message.reply_text(
-                "Este comando e restrito a administradores."
-            )
-            return
-
         stats = await self.db.get_stats()
-        feed_status = self.rss_monitor.check_feed_status()
-
-        lines = [
-            "<b>Estatisticas do Bot</b>",
-            "",
-            f"<b>Chats:</b>",
-            f"  Ativos: {stats['active_chats']}",
-            "",
-            f"<b>Mensagens:</b>",
-            f"  Total enviadas: {stats['total_messages_sent']}",
-            f"  Falhas de entrega: {stats['failed_deliveries']}",
-            "",
-            f"<b>RSS Feed:</b>",
-            f"  Status: {'Acessivel' if feed_status['reachable'] else 'Inacessivel'}",
-            f"  Entradas no feed: {feed_status.get('total_entries', 'N/A')}",
-            f"  Falhas consecutivas: {feed_status.get('consecutive_failures', 0)}",
-            "",
-            f"<b>Configuracao:</b>",
-            f"  Intervalo de check: {config.check_interval}s",
-            f"  Idade max eventos: {config.max_message_age_days} dias",
-            f"  Rate limit: {config.rate_limit_commands}/min",
-            f"  Admins: {len(config.get_admin_ids())}",
-        ]
-
-        if feed_status.get("last_post_date"):
-            date_str = feed_status["last_post_date"].strftime("%d/%m/%Y %H:%M")
-            lines.append(f"\n<b>Ultimo post:</b> {date_str}")
+        feed_status = await self.rss_monitor.check_feed_status()
+
+        text = _STATS_TEMPLATE.format_map({
+            **stats,
+            "feed_status": "Acessivel" if feed_status.reachable else "Inacessivel",
+            "total_entries": feed_status.total_entries,
+            "consecutive_failures": feed_status.consecutive_failures,
+            "check_interval": config.check_interval,
+            "max_message_age_days": config.max_message_age_days,
+            "rate_limit_commands": config.rate_limit_commands,
+            "admin_count": len(_ADMIN_IDS),
+        })
+
+        if feed_status.last_post_date:
+            date_str = feed_status.last_post_date.strftime("%d/%m/%Y %H:%M")
+            text += f"\n\n<b>Ultimo post:</b> {date_str}"
 
         await update.message.reply_text(
-            "\n".join(lines),
+            text,
             parse_mode=ParseMode.HTML
         )
 
@@ -914,105 +1116,201 @@ class IXBRBot:
         try:
             events = await self.rss_monitor.fetch_events()
 
-            if not events:
-                logger.debug("No events found in RSS feed")
-                return
-
-            active_chats = await self.db.get_active_chats()
+            active_chats = await self._get_active_chats_cached()
 
             if not active_chats:
                 logger.debug("No active chats to send updates to")
                 return
 
-            for event in events:
-                await self._send_event_to_chats(event, active_chats)
+            # Quiet hours state of every chat, evaluated once per tick
+            # against a single clock reading
+            now_ts = unix_time()
+            quiet_map = {
+                chat.chat_id: self._is_quiet_hours(
+                    chat.quiet_hours_start,
+                    chat.quiet_hours_end,
+                    chat.quiet_hours_tz,
+                    now_ts
+                )
+                for chat in active_chats
+            }
+
+            if events:
+                for event in events:
+                    await self._send_event_to_chats(event, active_chats, quiet_map)
+            else:
+                logger.debug("No events found in RSS feed")
 
             # Send pending notifications for chats exiting quiet hours
-            await self._process_pending_notifications(active_chats)
+            # (even without new events, so digests go out when silence ends)
+            await self._process_pending_notifications(active_chats, quiet_map)
 
-            # Cleanup
+        except Exception as e:
+            logger.error(f"Error checking RSS updates: {type(e).__name__}: {e}")
+
+    async def _flush_command_log_job(
+        self,
+        context: Optional[ContextTypes.DEFAULT_TYPE] = None
+    ) -> None:
+        """Write buffered command log entries to the database."""
+        try:
+            await self.db.flush_command_log()
+        except Exception as e:
+            logger.error(f"Command log flush failed: {type(e).__name__}: {e}")
+
+    async def _cleanup_job(
+        self,
+        context: Optional[ContextTypes.DEFAULT_TYPE] = None
+    ) -> None:
+        """Remove old sent messages, command log entries and idle send buckets."""
+        # A full bucket behaves exactly like a fresh one, so dropping it is safe
+        idle = [
+            chat_id for chat_id, bucket in self._chat_buckets.items()
+            if bucket.is_idle()
+        ]
+        for chat_id in idle:
+            del self._chat_buckets[chat_id]
+
+        try:
             await self.db.cleanup_old_messages()
             await self.db.cleanup_command_log()
-
         except Exception as e:
-            logger.error(f"Error checking RSS updates: {type(e).__name__}: {e}")
+            logger.error(f"Cleanup failed: {type(e).__name__}: {e}")
+
+    async def _get_active_chats_cached(self) -> list[ChatSub]:
+        """Active chats, read from the database only after a change."""
+        if self._active_chats_dirty or self._active_chats_cache is None:
+            # Clear the flag first so changes made during the read mark it again
+            self._active_chats_dirty = False
+            self._active_chats_cache = await self.db.get_active_chats()
+        return self._active_chats_cache
 
     async def _send_event_to_chats(
         self,
         event: StatusEvent,
-        chats: list[dict]
+        chats: list[ChatSub],
+        quiet_map: dict[int, bool]
     ) -> None:
         """Send or update an event to all specified chats."""
         message_text = event.to_telegram_message()
         current_hash = event.get_content_hash()
+        updated_text = f"{message_text}\n\n<i>[Mensagem atualizada]</i>"
+
+        quiet_ids = []
+        send_ids = []
+        for chat in chats:
+            chat_id = chat.chat_id
+            (quiet_ids if quiet_map[chat_id] else send_ids).append(chat_id)
+
+        # Store for later, one transaction for all chats in quiet hours
+        if quiet_ids:
+            await self.db.add_pending_notifications_bulk(
+                event.guid, message_text, event.title, quiet_ids
+            )
+            logger.debug(f"Notification queued (quiet hours): chats={len(quiet_ids)}")
 
-        for chat_info in chats:
-            chat_id = chat_info["chat_id"]
-
-            # Check quiet hours
-            if self._is_quiet_hours(
-                chat_info.get("quiet_hours_start"),
-                chat_info.get("quiet_hours_end"),
-                chat_info.get("quiet_hours_tz")
-            ):
-                # Store for later
-                await self.db.add_pending_notification(
-                    chat_id=chat_id,
-                    message_guid=event.guid,
-                    message_text=message_text,
-                    event_title=event.title
+        if not send_ids:
+            return
+
+        # One query for the delivery state of this event in every chat
+        sent_map = await self.db.get_sent_messages(event.guid, send_ids)
+
+        # Delivery results are collected here and written in one
+        # transaction after the fan-out, instead of one commit per chat
+        sent_rows: list[tuple] = []
+        edited_rows: list[tuple] = []
+
+        semaphore = asyncio.Semaphore(SEND_CONCURRENCY)
+
+        async def bounded_dispatch(chat_id: int) -> None:
+            async with semaphore:
+                await self._dispatch_one(
+                    event,
+                    chat_id,
+                    message_text,
+                    updated_text,
+                    current_hash,
+                    sent_map.get(chat_id),
+                    sent_rows,
+                    edited_rows
                 )
-                logger.debug(f"Notification queued (quiet hours): chat={chat_id}")
-                continue
-
-            # Check if message was already sent
-            existing = await self.db.get_sent_message(event.guid, chat_id)
-
-            if existing:
-                if existing["content_hash"] == current_hash:
-                    continue
-
-                # Content changed - try to edit
-                telegram_msg_id = existing.get("telegram_message_id")
-                if telegram_msg_id:
-                    try:
-                        updated_text = f"{message_text}\n\n<i>[Mensagem atualizada]</i>"
-
-                        await self.app.bot.edit_message_text(
-                            chat_id=chat_id,
-                            message_id=telegram_msg_id,
-                            text=updated_text,
-                            parse_mode=ParseMode.HTML,
-                            disable_web_page_preview=False
-                        )
 
-                        await self.db.update_message_record(
-                            message_guid=event.guid,
-                            chat_id=chat_id,
-                            content_hash=current_hash,
-                            message_title=event.title
-                        )
+        results = await asyncio.gather(
+            *(bounded_dispatch(chat_id) for chat_id in send_ids),
+            return_exceptions=True
+        )
+        for chat_id, result in zip(send_ids, results):
+            if isinstance(result, Exception):
+                logger.error(f"Event dispatch failed: chat={chat_id} error={result}")
+
+        await self.db.record_deliveries(sent_rows, edited_rows)
+
+    async def _dispatch_one(
+        self,
+        event: StatusEvent,
+        chat_id: int,
+        message_text: str,
+        updated_text: str,
+        current_hash: str,
+        existing: Optional[dict],
+        sent_rows: list[tuple],
+        edited_rows: list[tuple]
+    ) -> None:
+        """Edit or send an event for a single chat, collecting the result."""
+        # Check if message was already sent
+        if existing:
+            if existing["content_hash"] == current_hash:
+                return
+
+            # Content changed - try to edit
+            telegram_msg_id = existing.get("telegram_message_id")
+            if telegram_msg_id:
+                try:
+                    await self._acquire_send_slot(chat_id)
+                    await self.app.bot.edit_message_text(
+                        chat_id=chat_id,
+                        message_id=telegram_msg_id,
+                        text=updated_text,
+                        parse_mode=ParseMode.HTML,
+                        disable_web_page_preview=False
+                    )
+
+                    edited_rows.append(
+                        (current_hash, event.title, event.guid, chat_id)
+                    )
 
-                        logger.info(f"Message updated: chat={chat_id} msg_id={telegram_msg_id}")
+                    logger.info(f"Message updated: chat={chat_id} msg_id={telegram_msg_id}")
+                    return
 
-                        await asyncio.sleep(0.1)
-                        continue
+                except TelegramError as e:
+                    logger.warning(f"Could not edit message: chat={chat_id} error={e}")
 
-                    except TelegramError as e:
-                        logger.warning(f"Could not edit message: chat={chat_id} error={e}")
+        # Send new message
+        message_id = await self._send_message(chat_id, message_text)
+        if message_id is not None:
+            sent_rows.append(
+                (event.guid, chat_id, message_id, current_hash, event.title, "sent")
+            )
 
-            # Send new message
-            await self._send_message(chat_id, event, message_text, current_hash)
+    async def _acquire_send_slot(self, chat_id: int) -> None:
+        """Wait for both the global and the per-chat send budget."""
+        await self._global_bucket.acquire()
+        await self._chat_buckets[chat_id].acquire()
 
     async def _send_message(
         self,
         chat_id: int,
-        event: StatusEvent,
         message_text: str,
-        content_hash: str
-    ) -> bool:
-        """Send a message and handle delivery status."""
+        attempt: int = 0
+    ) -> Optional[int]:
+        """
+        Send a message and handle delivery errors.
+
+        Returns:
+            Telegram message ID, or None if delivery failed
+        """
         try:
+            await self._acquire_send_slot(chat_id)
             sent_message = await self.app.bot.send_message(
                 chat_id=chat_id,
                 text=message_text,
@@ -1020,141 +1318,181 @@ class IXBRBot:
                 disable_web_page_preview=False
             )
 
-            await self.db.mark_message_sent(
-                message_guid=event.guid,
-                chat_id=chat_id,
-                telegram_message_id=sent_message.message_id,
-                content_hash=content_hash,
-                message_title=event.title,
-                delivery_status="sent"
-            )
-
             logger.info(f"Message sent: chat={chat_id} msg_id={sent_message.message_id}")
+            return sent_message.message_id
 
-            await asyncio.sleep(0.1)
-            return True
+        except RetryAfter as e:
+            if attempt >= MAX_SEND_RETRIES:
+                logger.error(f"Message delivery failed: chat={chat_id} error={e}")
+                return None
 
-        except TelegramError as e:
-            error_str = str(e).lower()
+            # Hold back every other send too, then try this one again
+            logger.warning(f"Rate limited by Telegram: chat={chat_id} retry_after={e.retry_after}s")
+            self._global_bucket.pause(e.retry_after)
+            await asyncio.sleep(e.retry_after + 0.5)
+            return await self._send_message(chat_id, message_text, attempt + 1)
 
+        except TelegramError as e:
             # Determine if chat is permanently inaccessible
-            permanent_errors = [
-                "blocked", "deactivated", "not found",
-                "chat not found", "kicked", "forbidden"
-            ]
-
-            if any(x in error_str for x in permanent_errors):
+            if _PERM_ERR_RE.search(str(e)):
                 logger.warning(f"Chat inaccessible, unsubscribing: chat={chat_id} error={e}")
                 await self.db.unsubscribe_chat(chat_id)
+                self._active_chats_dirty = True
             else:
                 # Temporary error - log for tracking
                 logger.error(f"Message delivery failed: chat={chat_id} error={e}")
 
-            return False
+            return None
 
     async def _process_pending_notifications(
         self,
-        chats: list[dict]
+        chats: list[ChatSub],
+        quiet_map: dict[int, bool]
     ) -> None:
         """Send pending notifications for chats that exited quiet hours."""
-        for chat_info in chats:
-            chat_id = chat_info["chat_id"]
+        # One read finds the chats with anything queued, so chats with
+        # nothing pending never take the writer lock
+        with_pending = await self.db.get_chats_with_pending()
+        if not with_pending:
+            return
 
-            # Skip if still in quiet hours
-            if self._is_quiet_hours(
-                chat_info.get("quiet_hours_start"),
-                chat_info.get("quiet_hours_end"),
-                chat_info.get("quiet_hours_tz")
-            ):
-                continue
+        ready = [
+            chat.chat_id
+            for chat in chats
+            if chat.chat_id in with_pending and not quiet_map[chat.chat_id]
+        ]
+        if not ready:
+            return
 
-            pending = await self.db.get_pending_notifications(chat_id)
-            if not pending:
-                continue
+        # Flush chats concurrently; AIORateLimiter still enforces Telegram limits
+        semaphore = asyncio.Semaphore(PENDING_FLUSH_CONCURRENCY)
 
-            try:
-                # Send notifications
-                if len(pending) == 1:
-                    # Just send the single notification
-                    sent_msg = await self.app.bot.send_message(
-                        chat_id=chat_id,
-                        text=pending[0]["message_text"],
-                        parse_mode=ParseMode.HTML,
-                        disable_web_page_preview=False
-                    )
-                    # Mark as sent in sent_messages to prevent resend
-                    await self.db.mark_message_sent(
-                        message_guid=pending[0]["message_guid"],
-                        chat_id=chat_id,
-                        telegram_message_id=sent_msg.message_id,
-                        content_hash="pending_delivered",
-                        message_title=pending[0]["event_title"],
-                        delivery_status="sent"
-                    )
-                else:
-                    # Send summary header
-                    summary = (
-                        f"<b>Resumo: {len(pending)} notificacoes durante silencio</b>\n\n"
-                    )
-                    for p in pending[:5]:  # Limit to 5 in summary
-                        title = p["event_title"] or "Evento"
-                        if len(title) > 50:
-                            title = title[:50] + "..."
-                        summary += f"- {title}\n"
+        async def bounded_flush(chat_id: int) -> None:
+            async with semaphore:
+                await self._flush_digest(chat_id)
 
-                    if len(pending) > 5:
-                        summary += f"\n... e mais {len(pending) - 5} eventos."
+        await asyncio.gather(*(bounded_flush(chat_id) for chat_id in ready))
 
-                    summary += "\n\nVeja detalhes em https://status.ix.br"
+    async def _flush_digest(self, chat_id: int) -> None:
+        """Send all pending notifications of a chat as a single message."""
+        pending = await self.db.pop_pending_notifications(chat_id)
+        if not pending:
+            return
 
-                    await self.app.bot.send_message(
-                        chat_id=chat_id,
-                        text=summary,
-                        parse_mode=ParseMode.HTML,
-                        disable_web_page_preview=True
-                    )
-                    # Mark all as sent
-                    for p in pending:
-                        await self.db.mark_message_sent(
-                            message_guid=p["message_guid"],
-                            chat_id=chat_id,
-                            telegram_message_id=0,  # Summary message
-                            content_hash="pending_summary",
-                            message_title=p["event_title"],
-                            delivery_status="sent"
-                        )
-            except TelegramError as e:
-                logger.error(f"Failed to send pending notifications: chat={chat_id} count={len(pending)} error={e}")
-                continue  # Don't clear if sending failed
+        try:
+            # Send notifications
+            if len(pending) == 1:
+                # Just send the single notification
+                sent_msg = await self.app.bot.send_message(
+                    chat_id=chat_id,
+                    text=pending[0]["message_text"],
+                    parse_mode=ParseMode.HTML,
+                    disable_web_page_preview=False
+                )
+                # Mark as sent in sent_messages to prevent resend
+                await self.db.mark_message_sent(
+                    message_guid=pending[0]["message_guid"],
+                    chat_id=chat_id,
+                    telegram_message_id=sent_msg.message_id,
+                    content_hash="pending_delivered",
+                    message_title=pending[0]["event_title"],
+                    delivery_status="sent"
+                )
+            else:
+                # Send summary header
+                summary = (
+                    f"<b>Resumo: {len(pending)} notificacoes durante silencio</b>\n\n"
+                )
+                for p in pending[:5]:  # Limit to 5 in summary
+                    title = p["event_title"] or "Evento"
+                    if len(title) > 50:
+                        title = title[:50] + "..."
+                    summary += f"- {title}\n"
 
-            # Clear pending
-            await self.db.clear_pending_notifications(chat_id)
-            logger.info(f"Sent pending notifications: chat={chat_id} count={len(pending)}")
+                if len(pending) > 5:
+                    summary += f"\n... e mais {len(pending) - 5} eventos."
+
+                summary += "\n\nVeja detalhes em https://status.ix.br"
+
+                await self.app.bot.send_message(
+                    chat_id=chat_id,
+                    text=summary,
+                    parse_mode=ParseMode.HTML,
+                    disable_web_page_preview=True
+                )
+                # Mark all as sent (0 = summary message)
+                await self.db.mark_messages_sent_bulk([
+                    (p["message_guid"], chat_id, 0, "pending_summary",
+                     p["event_title"], "sent")
+                    for p in pending
+                ])
+        except TelegramError as e:
+            logger.error(f"Failed to send pending notifications: chat={chat_id} count={len(pending)} error={e}")
+            # Put them back so they are retried on the next check
+            await self.db.requeue_pending_notifications(chat_id, pending)
+            return
+
+        logger.info(f"Sent pending notifications: chat={chat_id} count={len(pending)}")
 
     # ==================== Health Check ====================
 
     async def _health_check_loop(self) -> None:
         """Periodically update health check file."""
         health_file = Path(config.health_check_file)
+        # Kept open across ticks; each write is a pwrite + ftruncate
+        fd: Optional[int] = None
+        # Ticks are scheduled on the monotonic clock, so wall-clock jumps
+        # and slow writes do not shift the heartbeat
+        next_tick = monotonic()
 
-        while not self._shutdown_event.is_set():
-            try:
-                # Write current timestamp
-                health_file.write_text(
-                    datetime.now().isoformat()
-                )
-            except Exception as e:
-                logger.error(f"Health check write failed: {e}")
+        try:
+            while not self._shutdown_event.is_set():
+                next_tick += HEALTH_CHECK_INTERVAL
+                try:
+                    # Reopen if the file was removed or replaced since it was
+                    # opened: writes to the orphaned inode are never seen
+                    if fd is not None:
+                        try:
+                            current = os.stat(health_file)
+                        except FileNotFoundError:
+                            current = None
+                        opened = os.fstat(fd)
+                        if current is None or (
+                            (current.st_dev, current.st_ino) !=
+                            (opened.st_dev, opened.st_ino)
+                        ):
+                            os.close(fd)
+                            fd = None
+
+                    if fd is None:
+                        fd = os.open(
+                            health_file,
+                            os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+                            0o644
+                        )
 
-            # Wait 30 seconds or until shutdown
-            try:
-                await asyncio.wait_for(
-                    self._shutdown_event.wait(),
-                    timeout=30
-                )
-                break
-            except asyncio.TimeoutError:
-                pass
+                    # Write current timestamp
+                    ts = datetime.now().isoformat().encode()
+                    os.pwrite(fd, ts, 0)
+                    os.ftruncate(fd, len(ts))
+                except OSError as e:
+                    logger.error(f"Health check write failed: {e}")
+                    if fd is not None:
+                        os.close(fd)
+                        fd = None
+
+                # Wait until the next tick or until shutdown
+                try:
+                    await asyncio.wait_for(
+                        self._shutdown_event.wait(),
+                        timeout=max(0.0, next_tick - monotonic())
+                    )
+                    break
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if fd is not None:
+                os.close(fd)
 
     # ==================== Auto Backup ====================
 
@@ -1169,10 +1507,9 @@ class IXBRBot:
         try:
             backup_data = await self.db.export_backup()
 
-            json_str = json.dumps(backup_data, indent=2, ensure_ascii=False)
-            json_bytes = json_str.encode("utf-8")
+            json_bytes = orjson.dumps(backup_data, option=orjson.OPT_INDENT_2)
 
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = datetime.now(tz.utc).strftime("%Y%m%d_%H%M%S")
             filename = f"ixbr_bot_backup_{timestamp}.json"
 
             await self.app.bot.send_document(
@@ -1215,6 +1552,22 @@ class IXBRBot:
             first=10
         )
 
+        # Persist the buffered command log in batches
+        job_queue.run_repeating(
+            callback=self._flush_command_log_job,
+            interval=COMMAND_LOG_FLUSH_INTERVAL,
+            first=COMMAND_LOG_FLUSH_INTERVAL,
+            name="command_log_flush"
+        )
+
+        # Schedule cleanup of old records (off the RSS hot path)
+        job_queue.run_repeating(
+            callback=self._cleanup_job,
+            interval=CLEANUP_INTERVAL,
+            first=60,
+            name="cleanup"
+        )
+
         # Schedule auto backup (daily at 3 AM)
         if config.backup_enabled and config.backup_chat_id:
             job_queue.run_daily(
@@ -1224,7 +1577,7 @@ class IXBRBot:
             )
             logger.info(f"Auto backup scheduled: target_chat={config.backup_chat_id}")
 
-        logger.info(f"Starting bot (interval={config.check_interval}s, admins={len(config.get_admin_ids())})")
+        logger.info(f"Starting bot (interval={config.check_interval}s, admins={len(_ADMIN_IDS)})")
 
         # Start polling with retry
         await self.app.initialize()
@@ -1276,6 +1629,11 @@ class IXBRBot:
         except Exception as e:
             logger.debug(f"Error during shutdown (may be normal): {e}")
 
+        # Close the database (flushes the buffered command log)
+        await self.db.close()
+
+        await self.rss_monitor.aclose()
+
         logger.info("Bot stopped successfully")
 
     def signal_handler(self, sig: signal.Signals) -> None:
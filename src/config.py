@@ -4,14 +4,36 @@ Uses Pydantic for validation and standard logging format.
 """
 
 import sys
+import atexit
 import logging
+import queue
+import re
+from functools import cached_property
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
-from datetime import time
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Quiet hours timezones (common timezones for Brazil), as UTC offsets in hours
+TIMEZONES = {
+    "UTC": 0,
+    "BRT": -3,      # Brasilia Time (most of Brazil)
+    "AMT": -4,      # Amazon Time
+    "ACT": -5,      # Acre Time
+    "FNT": -2,      # Fernando de Noronha Time
+}
+
+# Valid quiet hours time, HH:MM (hour may have one digit)
+HHMM_RE = re.compile(r"^([01]?\d|2[0-3]):([0-5]\d)$")
+
+# Separators between admin user IDs (commas and/or whitespace)
+ADMIN_IDS_SEP_RE = re.compile(r"[,\s]+")
+
+# Valid Telegram user ID (plain positive integer)
+USER_ID_RE = re.compile(r"^[1-9]\d*$")
+
 
 class Settings(BaseSettings):
     """
@@ -37,6 +59,12 @@ class Settings(BaseSettings):
         description="IX.br status RSS feed URL"
     )
 
+    # Parse the feed with feedparser instead of the built-in RSS reader
+    rss_use_feedparser: bool = Field(
+        default=False,
+        description="Use feedparser instead of the built-in RSS 2.0 reader"
+    )
+
     # Check interval in seconds
     check_interval: int = Field(
         default=300,
@@ -119,23 +147,27 @@ class Settings(BaseSettings):
             return None
         return int(v)
 
-    def get_admin_ids(self) -> set[int]:
-        """Get set of admin user IDs."""
-        if not self.admin_user_ids:
-            return set()
-        
-        try:
-            return {
-                int(uid.strip()) 
-                for uid in self.admin_user_ids.split(",") 
-                if uid.strip().isdigit()
-            }
-        except ValueError:
-            return set()
+    @cached_property
+    def admin_ids(self) -> frozenset[int]:
+        """
+        Admin user IDs, parsed once from admin_user_ids.
+
+        Tokens that are not a plain positive user ID (e.g. "123abc" or a
+        negative group ID) are logged and ignored, never reinterpreted.
+        """
+        admins = set()
+        for token in ADMIN_IDS_SEP_RE.split(self.admin_user_ids.strip()):
+            if not token:
+                continue
+            if USER_ID_RE.match(token):
+                admins.add(int(token))
+            else:
+                logger.warning(f"Ignoring invalid admin user ID: {token!r}")
+        return frozenset(admins)
 
     def is_admin(self, user_id: int) -> bool:
         """Check if a user ID is an admin."""
-        return user_id in self.get_admin_ids()
+        return user_id in self.admin_ids
 
     @field_validator("telegram_bot_token")
     @classmethod
@@ -186,22 +218,6 @@ class Settings(BaseSettings):
                 f"Invalid time format: {v}. Expected HH:MM (e.g., '22:00')"
             )
 
-    def get_quiet_hours(self) -> Optional[tuple[time, time]]:
-        """
-        Get quiet hours as time objects.
-        Returns None if quiet hours are not configured.
-        """
-        if not self.quiet_hours_start or not self.quiet_hours_end:
-            return None
-
-        start_parts = self.quiet_hours_start.split(":")
-        end_parts = self.quiet_hours_end.split(":")
-
-        start = time(int(start_parts[0]), int(start_parts[1]))
-        end = time(int(end_parts[0]), int(end_parts[1]))
-
-        return (start, end)
-
     def ensure_data_directory(self) -> None:
         """Ensure the data directory exists."""
         db_path = Path(self.database_path)
@@ -216,6 +232,9 @@ def setup_logging(log_level: str = "INFO") -> logging.Logger:
     Configure standard logging with clean, readable format.
     
     Format: YYYY-MM-DD HH:MM:SS | LEVEL | module | message
+
+    Records are handed to a background thread through a queue, so formatting
+    and stdout writes do not run on the event loop.
     
     Returns the configured logger instance.
     """
@@ -236,11 +255,17 @@ def setup_logging(log_level: str = "INFO") -> logging.Logger:
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
 
-    # Add stdout handler
+    # Stdout handler runs in the listener thread; only the queue handler is attached
     stdout_handler = logging.StreamHandler(sys.stdout)
     stdout_handler.setLevel(numeric_level)
     stdout_handler.setFormatter(formatter)
-    root_logger.addHandler(stdout_handler)
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    root_logger.addHandler(QueueHandler(log_queue))
+
+    listener = QueueListener(log_queue, stdout_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
 
     # Reduce noise from third-party libraries
     logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -3,12 +3,186 @@ Async database module for IX.br Status Bot.
 Uses aiosqlite for non-blocking database operations.
 """
 
+import asyncio
+import os
+from collections import OrderedDict, defaultdict, deque
+from time import monotonic, time
+
 import aiosqlite
-from datetime import datetime, timedelta
-from typing import Optional
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Optional
 from pathlib import Path
 
-from .config import config, logger
+from .config import HHMM_RE, TIMEZONES, config, logger
+
+# Applied to every new connection. WAL lets readers run alongside the writer,
+# and synchronous=NORMAL is durable enough under WAL while avoiding an fsync
+# per commit (a power loss can drop at most the commits since the last
+# checkpoint, never corrupt the database). cache_size is 64MB per
+# connection and reads go through a 256MB memory map.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -64000",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA foreign_keys = ON",
+)
+
+# Applied on top of CONNECTION_PRAGMAS for pooled readers: a stray write
+# through a reader fails instead of contending for the write lock
+READER_PRAGMAS = (
+    "PRAGMA query_only = ON",
+)
+
+# Number of read-only connections (writes always go through a single connection)
+READER_POOL_SIZE = max(2, min(os.cpu_count() or 2, 8))
+
+# Max chat IDs bound in a single "IN (...)" query
+SQL_IN_BATCH_SIZE = 500
+
+# Rows pulled per fetchmany() call when streaming large result sets
+FETCH_BATCH_SIZE = 500
+
+# Backup rows written per transaction during a restore
+IMPORT_BATCH_SIZE = 500
+
+# Recent command timestamps kept in memory per chat (rate limit window);
+# never fewer than the configured limit, or the limit could not be reached
+COMMAND_WINDOW_MAXLEN = max(256, config.rate_limit_commands)
+
+# Schema generation stored in PRAGMA user_version; bump when the schema changes
+SCHEMA_VERSION = 4
+
+# Columns holding INTEGER Unix seconds (TEXT CURRENT_TIMESTAMP before version 4)
+EPOCH_COLUMNS = (
+    ("sent_messages", "sent_at"),
+    ("sent_messages", "updated_at"),
+    ("command_log", "timestamp"),
+    ("pending_notifications", "created_at"),
+)
+
+# Background writes: how long the writer task waits to gather a batch
+# (seconds) and the max statements applied per transaction
+WRITE_BATCH_DELAY = 0.05
+WRITE_BATCH_MAX = 500
+
+# Prepared statements kept per connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Chat subscription rows kept in memory (least recently used are evicted)
+CHAT_STATE_CACHE_SIZE = 10000
+
+# Hot statements, shared by every method that runs them. Timestamps are written
+# explicitly as Unix seconds, since pre-version-4 tables default to TEXT. sqlite3 keeps
+# prepared statements per connection keyed by SQL text (see
+# STATEMENT_CACHE_SIZE), so reusing the same string skips parse and plan.
+_SQL_GET_CHAT_STATE = """
+    SELECT is_active, quiet_hours_start, quiet_hours_end, quiet_hours_tz
+    FROM subscribed_chats WHERE chat_id = ?
+"""
+_SQL_SET_QUIET_HOURS = """
+    UPDATE subscribed_chats
+    SET quiet_hours_start = ?, quiet_hours_end = ?, quiet_hours_tz = ?
+    WHERE chat_id = ? AND is_active = 1
+"""
+_SQL_LOG_COMMAND = """
+    INSERT INTO command_log (chat_id, command, timestamp) VALUES (?, ?, ?)
+"""
+_SQL_MARK_SENT = """
+    INSERT INTO sent_messages
+    (message_guid, chat_id, telegram_message_id, content_hash,
+     message_title, sent_at, delivery_status)
+    VALUES (?, ?, ?, ?, ?, strftime('%s', 'now'), ?)
+    ON CONFLICT(message_guid, chat_id) DO UPDATE SET
+        telegram_message_id = excluded.telegram_message_id,
+        content_hash = excluded.content_hash,
+        message_title = excluded.message_title,
+        sent_at = excluded.sent_at,
+        delivery_status = excluded.delivery_status
+"""
+_SQL_UPDATE_MESSAGE_RECORD = """
+    UPDATE sent_messages
+    SET content_hash = ?, message_title = ?, updated_at = strftime('%s', 'now')
+    WHERE message_guid = ? AND chat_id = ?
+"""
+_SQL_ADD_PENDING = """
+    INSERT OR IGNORE INTO pending_notifications
+    (chat_id, message_guid, message_text, event_title, created_at)
+    VALUES (?, ?, ?, ?, strftime('%s', 'now'))
+"""
+
+
+@dataclass(slots=True, frozen=True)
+class ChatSub:
+    """An active subscribed chat and its quiet hours settings."""
+    chat_id: int
+    chat_type: str
+    quiet_hours_start: Optional[str]
+    quiet_hours_end: Optional[str]
+    quiet_hours_tz: Optional[str]
+
+
+def _pending_dict(row: tuple) -> dict:
+    """Pending notification row (id, guid, text, title, created_at) as a dict."""
+    return {
+        "id": row[0],
+        "message_guid": row[1],
+        "message_text": row[2],
+        "event_title": row[3],
+        "created_at": row[4],
+    }
+
+
+def _optional_str(chat: dict, key: str, default: Optional[str] = None) -> Optional[str]:
+    """Text field of a backup chat: a string or None (missing keys use default)."""
+    value = chat.get(key, default)
+    if value is not None and not isinstance(value, str):
+        raise ValueError(f"{key} must be a string")
+    return value
+
+
+def _backup_row(chat: dict, now: str) -> tuple:
+    """
+    Validate and coerce one backup chat into a subscribed_chats row.
+
+    Raises:
+        ValueError: If a field has the wrong type or an invalid value
+    """
+    chat_id = chat.get("chat_id")
+    if isinstance(chat_id, bool) or not isinstance(chat_id, (int, str)):
+        raise ValueError("chat_id must be an integer")
+    chat_id = int(chat_id)
+    if chat_id == 0 or not -2**63 <= chat_id < 2**63:
+        raise ValueError(f"chat_id out of range: {chat_id}")
+
+    is_active = chat.get("is_active", 1)
+    if not isinstance(is_active, int) or is_active not in (0, 1):
+        raise ValueError("is_active must be 0 or 1")
+
+    quiet_start = _optional_str(chat, "quiet_hours_start")
+    quiet_end = _optional_str(chat, "quiet_hours_end")
+    for value in (quiet_start, quiet_end):
+        if value is not None and not HHMM_RE.match(value):
+            raise ValueError(f"Invalid quiet hours time: {value!r}")
+
+    quiet_tz = _optional_str(chat, "quiet_hours_tz", "UTC")
+    if quiet_tz is not None and quiet_tz not in TIMEZONES:
+        raise ValueError(f"Invalid quiet hours timezone: {quiet_tz!r}")
+
+    return (
+        chat_id,
+        _optional_str(chat, "chat_type", "unknown") or "unknown",
+        _optional_str(chat, "chat_title"),
+        _optional_str(chat, "subscribed_at", now) or now,
+        int(is_active),
+        quiet_start,
+        quiet_end,
+        quiet_tz
+    )
 
 
 class Database:
@@ -24,6 +198,131 @@ class Database:
         """
         self.db_path = db_path or config.database_path
         self._initialized = False
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._writer_lock = asyncio.Lock()
+        self._readers: Optional[asyncio.Queue[aiosqlite.Connection]] = None
+        # Every pooled reader, including ones currently borrowed
+        self._reader_conns: list[aiosqlite.Connection] = []
+        # Recent command times per chat: the rate limit window used by
+        # check_and_log_command(). The log rows themselves are buffered and
+        # persisted in bulk by flush_command_log().
+        self._cmd_times: defaultdict[int, deque[float]] = defaultdict(
+            lambda: deque(maxlen=COMMAND_WINDOW_MAXLEN)
+        )
+        self._cmd_log_buffer: list[tuple[int, str, int]] = []
+        # Low-durability writes (sql, rows), applied in batches by _write_loop()
+        self._write_queue: Optional[asyncio.Queue[tuple[str, list[tuple]]]] = None
+        self._write_task: Optional[asyncio.Task] = None
+        # chat_id -> (is_active, quiet_start, quiet_end, quiet_tz), None if the
+        # chat has no row. Writers bump the generation so a read that raced
+        # with a write does not store a stale row. LRU, capped at
+        # CHAT_STATE_CACHE_SIZE (unknown chats are cached too).
+        self._chat_state_cache: OrderedDict[int, Optional[tuple]] = OrderedDict()
+        self._chat_state_gen = 0
+
+    async def _open_connection(self, readonly: bool = False) -> aiosqlite.Connection:
+        """Open a connection with the standard PRAGMAs applied."""
+        if readonly:
+            uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            db = await aiosqlite.connect(
+                uri, uri=True, cached_statements=STATEMENT_CACHE_SIZE
+            )
+        else:
+            # Autocommit mode: transactions are opened explicitly by writer()
+            db = await aiosqlite.connect(
+                self.db_path,
+                isolation_level=None,
+                cached_statements=STATEMENT_CACHE_SIZE
+            )
+
+        for pragma in CONNECTION_PRAGMAS:
+            await db.execute(pragma)
+        if readonly:
+            for pragma in READER_PRAGMAS:
+                await db.execute(pragma)
+        return db
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a read-only connection from the pool."""
+        db = await self._readers.get()
+        try:
+            yield db
+        finally:
+            self._readers.put_nowait(db)
+
+    @asynccontextmanager
+    async def writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Use the single writer connection inside a BEGIN IMMEDIATE transaction.
+        Commits on success and rolls back if the block or the commit raises
+        (e.g. SQLITE_BUSY), so the connection is never left in a transaction.
+        """
+        async with self._writer_lock:
+            db = self._writer
+            await db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+                await db.commit()
+            except BaseException:
+                await db.rollback()
+                raise
+
+    def _enqueue_write(self, sql: str, rows: list[tuple]) -> None:
+        """
+        Queue rows for the background writer; returns without waiting for the commit.
+
+        Raises:
+            RuntimeError: If the database is not initialized or was closed
+        """
+        if self._write_queue is None:
+            raise RuntimeError("Database is closed; background write rejected")
+        self._write_queue.put_nowait((sql, rows))
+
+    async def _write_loop(self) -> None:
+        """Apply queued writes, up to WRITE_BATCH_MAX statements per transaction."""
+        queue = self._write_queue
+        while True:
+            batch = [await queue.get()]
+            # Let writes issued in the same burst join this transaction
+            await asyncio.sleep(WRITE_BATCH_DELAY)
+            while len(batch) < WRITE_BATCH_MAX and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            try:
+                async with self.writer() as db:
+                    for sql, rows in batch:
+                        await db.executemany(sql, rows)
+            except Exception as e:
+                logger.error(f"Background write failed: statements={len(batch)} error={e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def flush_writes(self) -> None:
+        """Wait until every queued background write is committed."""
+        if self._write_queue is not None:
+            await self._write_queue.join()
+
+    @asynccontextmanager
+    async def _chat_writer(
+        self,
+        chat_id: Optional[int] = None
+    ) -> AsyncIterator[aiosqlite.Connection]:
+        """writer() for subscribed_chats changes; drops cached chat rows after commit."""
+        try:
+            async with self.writer() as db:
+                yield db
+        finally:
+            self._invalidate_chat_state(chat_id)
+
+    def _invalidate_chat_state(self, chat_id: Optional[int] = None) -> None:
+        """Drop the cached row of a chat, or of every chat if chat_id is None."""
+        self._chat_state_gen += 1
+        if chat_id is None:
+            self._chat_state_cache.clear()
+        else:
+            self._chat_state_cache.pop(chat_id, None)
 
     async def init(self) -> None:
         """Initialize database tables. Must be called before using the database."""
@@ -33,10 +332,9 @@ class Database:
         # Ensure directory exists
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
 
-        async with aiosqlite.connect(self.db_path) as db:
-            # Enable foreign keys
-            await db.execute("PRAGMA foreign_keys = ON")
+        self._writer = await self._open_connection()
 
+        async with self.writer() as db:
             # Table for subscribed chats
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS subscribed_chats (
@@ -59,8 +357,8 @@ class Database:
                     chat_id INTEGER NOT NULL,
                     telegram_message_id INTEGER,
                     content_hash TEXT,
-                    sent_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP,
+                    sent_at INTEGER DEFAULT (strftime('%s', 'now')),
+                    updated_at INTEGER,
                     message_title TEXT,
                     delivery_status TEXT DEFAULT 'sent',
                     UNIQUE(message_guid, chat_id)
@@ -73,7 +371,7 @@ class Database:
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     chat_id INTEGER NOT NULL,
                     command TEXT NOT NULL,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    timestamp INTEGER DEFAULT (strftime('%s', 'now'))
                 )
             """)
 
@@ -85,35 +383,54 @@ class Database:
                     message_guid TEXT NOT NULL,
                     message_text TEXT NOT NULL,
                     event_title TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    created_at INTEGER DEFAULT (strftime('%s', 'now')),
                     UNIQUE(message_guid, chat_id)
                 )
             """)
 
-            # Indexes
-            await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_sent_messages_guid
-                ON sent_messages(message_guid)
-            """)
+            # Run migrations for existing databases (before indexes on new columns)
+            await self._migrate(db)
+
+            # Indexes. Lookups by (message_guid, chat_id) use the UNIQUE index,
+            # so the old single-column and covering indexes are dropped: each
+            # one only added a B-tree update to every delivery insert
+            await db.execute("DROP INDEX IF EXISTS idx_sent_messages_guid")
+            await db.execute("DROP INDEX IF EXISTS idx_sent_messages_lookup")
             await db.execute("""
                 CREATE INDEX IF NOT EXISTS idx_sent_messages_chat
                 ON sent_messages(chat_id)
             """)
+            # Partial index: failed deliveries are rare, so counting them stays cheap
+            await db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_sent_failed
+                ON sent_messages(delivery_status) WHERE delivery_status = 'failed'
+            """)
             await db.execute("""
                 CREATE INDEX IF NOT EXISTS idx_command_log_chat_time
                 ON command_log(chat_id, timestamp)
             """)
 
-            await db.commit()
+        # Readers are opened after the schema exists and WAL is enabled
+        self._reader_conns = list(await asyncio.gather(*(
+            self._open_connection(readonly=True) for _ in range(READER_POOL_SIZE)
+        )))
+        self._readers = asyncio.Queue()
+        for conn in self._reader_conns:
+            self._readers.put_nowait(conn)
 
-            # Run migrations for existing databases
-            await self._migrate(db)
+        self._write_queue = asyncio.Queue()
+        self._write_task = asyncio.create_task(self._write_loop())
 
         self._initialized = True
         logger.info(f"Database initialized: {self.db_path}")
 
     async def _migrate(self, db: aiosqlite.Connection) -> None:
-        """Run migrations for existing databases."""
+        """Run migrations for existing databases (inside the init transaction)."""
+        cursor = await db.execute("PRAGMA user_version")
+        (version,) = await cursor.fetchone()
+        if version >= SCHEMA_VERSION:
+            return
+
         # Get existing columns
         cursor = await db.execute("PRAGMA table_info(subscribed_chats)")
         columns = {row[1] for row in await cursor.fetchall()}
@@ -151,14 +468,52 @@ class Database:
             )
         if "updated_at" not in columns:
             await db.execute(
-                "ALTER TABLE sent_messages ADD COLUMN updated_at TIMESTAMP"
+                "ALTER TABLE sent_messages ADD COLUMN updated_at INTEGER"
             )
         if "delivery_status" not in columns:
             await db.execute(
                 "ALTER TABLE sent_messages ADD COLUMN delivery_status TEXT DEFAULT 'sent'"
             )
 
-        await db.commit()
+        if version < 4:
+            # Convert CURRENT_TIMESTAMP text to Unix seconds
+            for table, column in EPOCH_COLUMNS:
+                await db.execute(
+                    f"""UPDATE {table}
+                        SET {column} = CAST(strftime('%s', {column}) AS INTEGER)
+                        WHERE typeof({column}) = 'text'"""
+                )
+
+        # PRAGMA does not accept bound parameters
+        await db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        logger.info(f"Database schema at version {SCHEMA_VERSION}")
+
+    async def close(self) -> None:
+        """Flush buffered writes and close all database connections."""
+        if self._writer is not None:
+            await self.flush_command_log()
+
+        if self._write_task is not None:
+            # Reject new background writes, then drain the ones already queued
+            queue, self._write_queue = self._write_queue, None
+            await queue.join()
+            self._write_task.cancel()
+            try:
+                await self._write_task
+            except asyncio.CancelledError:
+                pass
+            self._write_task = None
+
+        for conn in self._reader_conns:
+            await conn.close()
+        self._reader_conns = []
+        self._readers = None
+
+        if self._writer is not None:
+            await self._writer.close()
+            self._writer = None
+
+        self._initialized = False
 
     # ==================== Chat Subscription Methods ====================
 
@@ -172,7 +527,7 @@ class Database:
         Subscribe a chat to receive status updates.
         Returns True if new subscription, False if already subscribed.
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._chat_writer(chat_id) as db:
             # Check if already subscribed
             cursor = await db.execute(
                 "SELECT is_active FROM subscribed_chats WHERE chat_id = ?",
@@ -193,7 +548,6 @@ class Database:
                            WHERE chat_id = ?""",
                         (chat_title, chat_id)
                     )
-                    await db.commit()
                     logger.info(f"Chat resubscribed: {chat_id}")
                     return True
 
@@ -203,45 +557,61 @@ class Database:
                    VALUES (?, ?, ?)""",
                 (chat_id, chat_type, chat_title)
             )
-            await db.commit()
             logger.info(f"Chat subscribed: {chat_id} ({chat_type})")
             return True
 
     async def unsubscribe_chat(self, chat_id: int) -> bool:
         """Unsubscribe a chat. Returns True if was subscribed."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._chat_writer(chat_id) as db:
             cursor = await db.execute(
                 """UPDATE subscribed_chats
                    SET is_active = 0
                    WHERE chat_id = ? AND is_active = 1""",
                 (chat_id,)
             )
-            await db.commit()
 
             if cursor.rowcount > 0:
                 logger.info(f"Chat unsubscribed: {chat_id}")
                 return True
             return False
 
-    async def get_active_chats(self) -> list[dict]:
-        """Get list of all active subscribed chats with their settings."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
+    async def iter_active_chats(self) -> AsyncIterator[ChatSub]:
+        """Yield active subscribed chats, fetched in batches of FETCH_BATCH_SIZE."""
+        async with self.reader() as db:
             cursor = await db.execute(
                 """SELECT chat_id, chat_type, quiet_hours_start, quiet_hours_end, quiet_hours_tz
                    FROM subscribed_chats WHERE is_active = 1"""
             )
-            rows = await cursor.fetchall()
-            return [dict(row) for row in rows]
+            while rows := await cursor.fetchmany(FETCH_BATCH_SIZE):
+                for row in rows:
+                    yield ChatSub(*row)
+
+    async def get_active_chats(self) -> list[ChatSub]:
+        """Get list of all active subscribed chats with their settings."""
+        return [chat async for chat in self.iter_active_chats()]
+
+    async def _get_chat_state(self, chat_id: int) -> Optional[tuple]:
+        """Subscription row of a chat, served from memory after the first read."""
+        if chat_id in self._chat_state_cache:
+            self._chat_state_cache.move_to_end(chat_id)
+            return self._chat_state_cache[chat_id]
+
+        gen = self._chat_state_gen
+        async with self.reader() as db:
+            cursor = await db.execute(_SQL_GET_CHAT_STATE, (chat_id,))
+            row = await cursor.fetchone()
+
+        state = tuple(row) if row else None
+        if gen == self._chat_state_gen:
+            self._chat_state_cache[chat_id] = state
+            if len(self._chat_state_cache) > CHAT_STATE_CACHE_SIZE:
+                self._chat_state_cache.popitem(last=False)
+        return state
 
     async def is_chat_subscribed(self, chat_id: int) -> bool:
         """Check if a chat is currently subscribed."""
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
-                "SELECT 1 FROM subscribed_chats WHERE chat_id = ? AND is_active = 1",
-                (chat_id,)
-            )
-            return await cursor.fetchone() is not None
+        state = await self._get_chat_state(chat_id)
+        return bool(state and state[0])
 
     async def set_quiet_hours(
         self,
@@ -251,14 +621,11 @@ class Database:
         timezone: Optional[str] = "UTC"
     ) -> bool:
         """Set quiet hours for a chat. Pass None to disable."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._chat_writer(chat_id) as db:
             cursor = await db.execute(
-                """UPDATE subscribed_chats
-                   SET quiet_hours_start = ?, quiet_hours_end = ?, quiet_hours_tz = ?
-                   WHERE chat_id = ? AND is_active = 1""",
+                _SQL_SET_QUIET_HOURS,
                 (start, end, timezone, chat_id)
             )
-            await db.commit()
             return cursor.rowcount > 0
 
     async def get_chat_quiet_hours(
@@ -266,16 +633,10 @@ class Database:
         chat_id: int
     ) -> Optional[tuple[str, str, str]]:
         """Get quiet hours for a chat. Returns (start, end, timezone) or None."""
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
-                """SELECT quiet_hours_start, quiet_hours_end, quiet_hours_tz
-                   FROM subscribed_chats WHERE chat_id = ?""",
-                (chat_id,)
-            )
-            row = await cursor.fetchone()
-            if row and row[0] and row[1]:
-                return (row[0], row[1], row[2] or "UTC")
-            return None
+        state = await self._get_chat_state(chat_id)
+        if state and state[1] and state[2]:
+            return (state[1], state[2], state[3] or "UTC")
+        return None
 
     # ==================== Sent Messages Methods ====================
 
@@ -285,8 +646,7 @@ class Database:
         chat_id: int
     ) -> Optional[dict]:
         """Get information about a sent message."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self.reader() as db:
             cursor = await db.execute(
                 """SELECT telegram_message_id, content_hash, message_title,
                           delivery_status
@@ -296,9 +656,40 @@ class Database:
             )
             row = await cursor.fetchone()
             if row:
-                return dict(row)
+                return {
+                    "telegram_message_id": row[0],
+                    "content_hash": row[1],
+                    "message_title": row[2],
+                    "delivery_status": row[3],
+                }
             return None
 
+    async def get_sent_messages(
+        self,
+        message_guid: str,
+        chat_ids: list[int]
+    ) -> dict[int, dict]:
+        """Get sent message info of one event for many chats, keyed by chat_id."""
+        result: dict[int, dict] = {}
+        async with self.reader() as db:
+            # Stay well below SQLite's bound parameter limit
+            for i in range(0, len(chat_ids), SQL_IN_BATCH_SIZE):
+                batch = chat_ids[i:i + SQL_IN_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                cursor = await db.execute(
+                    f"""SELECT chat_id, telegram_message_id, content_hash
+                        FROM sent_messages
+                        WHERE message_guid = ? AND chat_id IN ({placeholders})""",
+                    (message_guid, *batch)
+                )
+                for chat_id, telegram_message_id, content_hash in await cursor.fetchall():
+                    result[chat_id] = {
+                        "chat_id": chat_id,
+                        "telegram_message_id": telegram_message_id,
+                        "content_hash": content_hash,
+                    }
+        return result
+
     async def mark_message_sent(
         self,
         message_guid: str,
@@ -308,19 +699,33 @@ class Database:
         message_title: Optional[str] = None,
         delivery_status: str = "sent"
     ) -> None:
-        """Mark a message as sent to a specific chat."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                """INSERT OR REPLACE INTO sent_messages
-                   (message_guid, chat_id, telegram_message_id, content_hash,
-                    message_title, sent_at, delivery_status)
-                   VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP, ?)""",
-                (message_guid, chat_id, telegram_message_id, content_hash,
-                 message_title, delivery_status)
-            )
-            await db.commit()
+        """
+        Mark a message as sent to a specific chat.
+        Returns once queued; written by the background writer (see flush_writes()).
+        """
+        self._enqueue_write(
+            _SQL_MARK_SENT,
+            [(message_guid, chat_id, telegram_message_id, content_hash,
+              message_title, delivery_status)]
+        )
+
+        logger.debug(f"Message marked as sent: chat={chat_id} msg_id={telegram_message_id}")
+
+    async def mark_messages_sent_bulk(self, rows: list[tuple]) -> None:
+        """
+        Mark several messages as sent with a single executemany.
+        Returns once queued; written by the background writer (see flush_writes()).
+
+        Args:
+            rows: Tuples of (message_guid, chat_id, telegram_message_id,
+                  content_hash, message_title, delivery_status)
+        """
+        if not rows:
+            return
+
+        self._enqueue_write(_SQL_MARK_SENT, rows)
 
-            logger.debug(f"Message marked as sent: chat={chat_id} msg_id={telegram_message_id}")
+        logger.debug(f"Messages marked as sent: count={len(rows)}")
 
     async def update_message_record(
         self,
@@ -330,15 +735,42 @@ class Database:
         message_title: Optional[str] = None
     ) -> None:
         """Update the record of a sent message after editing."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.writer() as db:
             await db.execute(
-                """UPDATE sent_messages
-                   SET content_hash = ?, message_title = ?,
-                       updated_at = CURRENT_TIMESTAMP
-                   WHERE message_guid = ? AND chat_id = ?""",
+                _SQL_UPDATE_MESSAGE_RECORD,
                 (content_hash, message_title, message_guid, chat_id)
             )
-            await db.commit()
+
+    async def record_deliveries(
+        self,
+        sent_rows: list[tuple],
+        edited_rows: list[tuple]
+    ) -> None:
+        """
+        Persist the outcome of an event fan-out in a single transaction.
+
+        Args:
+            sent_rows: Tuples of (message_guid, chat_id, telegram_message_id,
+                       content_hash, message_title, delivery_status)
+            edited_rows: Tuples of (content_hash, message_title,
+                         message_guid, chat_id)
+        """
+        if not sent_rows and not edited_rows:
+            return
+
+        async with self.writer() as db:
+            if sent_rows:
+                await db.executemany(
+                    _SQL_MARK_SENT,
+                    sent_rows
+                )
+            if edited_rows:
+                await db.executemany(
+                    _SQL_UPDATE_MESSAGE_RECORD,
+                    edited_rows
+                )
+
+        logger.debug(f"Deliveries recorded: sent={len(sent_rows)} edited={len(edited_rows)}")
 
     async def update_delivery_status(
         self,
@@ -348,14 +780,13 @@ class Database:
         error_message: Optional[str] = None
     ) -> None:
         """Update delivery status of a message."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.writer() as db:
             await db.execute(
                 """UPDATE sent_messages
                    SET delivery_status = ?
                    WHERE message_guid = ? AND chat_id = ?""",
                 (status, message_guid, chat_id)
             )
-            await db.commit()
 
             if status == "failed":
                 logger.warning(f"Message delivery failed: chat={chat_id} error={error_message}")
@@ -365,14 +796,13 @@ class Database:
         if days is None:
             days = config.max_message_age_days * 2
 
-        cutoff = datetime.now() - timedelta(days=days)
+        cutoff = int(time()) - days * 86400
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.writer() as db:
             cursor = await db.execute(
                 "DELETE FROM sent_messages WHERE sent_at < ?",
-                (cutoff.isoformat(),)
+                (cutoff,)
             )
-            await db.commit()
             deleted = cursor.rowcount
 
             if deleted > 0:
@@ -381,42 +811,93 @@ class Database:
 
     # ==================== Rate Limiting Methods ====================
 
-    async def log_command(self, chat_id: int, command: str) -> None:
-        """Log a command for rate limiting."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                "INSERT INTO command_log (chat_id, command) VALUES (?, ?)",
-                (chat_id, command)
-            )
-            await db.commit()
+    def log_command(self, chat_id: int, command: str) -> None:
+        """
+        Log a command for rate limiting.
+        Counted in memory right away; written to command_log on the next
+        flush_command_log().
+        """
+        self._cmd_times[chat_id].append(monotonic())
+        self._cmd_log_buffer.append((chat_id, command, int(time())))
+
+    async def flush_command_log(self) -> int:
+        """Write buffered command log entries in one transaction."""
+        if not self._cmd_log_buffer:
+            return 0
+
+        rows, self._cmd_log_buffer = self._cmd_log_buffer, []
+        try:
+            async with self.writer() as db:
+                await db.executemany(_SQL_LOG_COMMAND, rows)
+        except BaseException:
+            # Keep the entries for the next flush
+            self._cmd_log_buffer[:0] = rows
+            raise
+        return len(rows)
+
+    def command_count_at_least(
+        self,
+        chat_id: int,
+        seconds: int,
+        threshold: int
+    ) -> bool:
+        """
+        Check if a chat sent at least `threshold` commands in the last N seconds.
+        Timestamps are kept in order, so only the threshold-th newest one is
+        looked at instead of counting the whole window.
+        """
+        if threshold <= 0:
+            return True
+
+        times = self._cmd_times.get(chat_id)
+        if not times or len(times) < threshold:
+            return False
+        return times[-threshold] > monotonic() - seconds
 
-    async def get_command_count(
+    async def check_and_log_command(
         self,
         chat_id: int,
-        seconds: int = 60
-    ) -> int:
-        """Get number of commands from a chat in the last N seconds."""
-        cutoff = datetime.now() - timedelta(seconds=seconds)
+        command: str,
+        seconds: int = 60,
+        limit: Optional[int] = None
+    ) -> bool:
+        """
+        Check the rate limit and log the command.
+        Returns True if the command is allowed (and was logged), False if rate limited.
 
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
-                """SELECT COUNT(*) FROM command_log
-                   WHERE chat_id = ? AND timestamp > ?""",
-                (chat_id, cutoff.isoformat())
-            )
-            row = await cursor.fetchone()
-            return row[0] if row else 0
+        Nothing is awaited between the check and the log, so concurrent
+        handlers cannot both take the last free slot.
+        """
+        if limit is None:
+            limit = config.rate_limit_commands
+
+        if self.command_count_at_least(chat_id, seconds, limit):
+            return False
+
+        self.log_command(chat_id, command)
+        return True
 
     async def cleanup_command_log(self, seconds: int = 300) -> None:
-        """Clean up old command log entries."""
-        cutoff = datetime.now() - timedelta(seconds=seconds)
+        """
+        Clean up old command log entries, and drop the in-memory window of
+        chats with no command in the last N seconds (longer than any rate
+        limit window, so no decision changes).
+        """
+        window_cutoff = monotonic() - seconds
+        idle = [
+            chat_id for chat_id, times in self._cmd_times.items()
+            if not times or times[-1] <= window_cutoff
+        ]
+        for chat_id in idle:
+            del self._cmd_times[chat_id]
+
+        cutoff = int(time()) - seconds
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.writer() as db:
             await db.execute(
                 "DELETE FROM command_log WHERE timestamp < ?",
-                (cutoff.isoformat(),)
+                (cutoff,)
             )
-            await db.commit()
 
     # ==================== Pending Notifications (Quiet Hours) ====================
 
@@ -427,25 +908,45 @@ class Database:
         message_text: str,
         event_title: Optional[str] = None
     ) -> None:
-        """Add a notification to be sent later (during quiet hours)."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                """INSERT OR IGNORE INTO pending_notifications
-                   (chat_id, message_guid, message_text, event_title)
-                   VALUES (?, ?, ?, ?)""",
-                (chat_id, message_guid, message_text, event_title)
+        """
+        Add a notification to be sent later (during quiet hours).
+        Returns once queued; written by the background writer (see flush_writes()).
+        """
+        self._enqueue_write(
+            _SQL_ADD_PENDING,
+            [(chat_id, message_guid, message_text, event_title)]
+        )
+
+        logger.debug(f"Added pending notification: chat={chat_id}")
+
+    async def add_pending_notifications_bulk(
+        self,
+        message_guid: str,
+        message_text: str,
+        event_title: Optional[str],
+        chat_ids: list[int]
+    ) -> None:
+        """Queue the same notification for several chats in one transaction."""
+        if not chat_ids:
+            return
+
+        async with self.writer() as db:
+            await db.executemany(
+                _SQL_ADD_PENDING,
+                [
+                    (chat_id, message_guid, message_text, event_title)
+                    for chat_id in chat_ids
+                ]
             )
-            await db.commit()
 
-            logger.debug(f"Added pending notification: chat={chat_id}")
+        logger.debug(f"Added pending notifications: count={len(chat_ids)}")
 
     async def get_pending_notifications(
         self,
         chat_id: int
     ) -> list[dict]:
         """Get all pending notifications for a chat."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self.reader() as db:
             cursor = await db.execute(
                 """SELECT id, message_guid, message_text, event_title, created_at
                    FROM pending_notifications
@@ -454,35 +955,73 @@ class Database:
                 (chat_id,)
             )
             rows = await cursor.fetchall()
-            return [dict(row) for row in rows]
+            return [_pending_dict(row) for row in rows]
+
+    async def get_chats_with_pending(self) -> set[int]:
+        """Chat IDs that have at least one pending notification (read-only)."""
+        async with self.reader() as db:
+            cursor = await db.execute(
+                "SELECT DISTINCT chat_id FROM pending_notifications"
+            )
+            return {row[0] for row in await cursor.fetchall()}
+
+    async def pop_pending_notifications(
+        self,
+        chat_id: int
+    ) -> list[dict]:
+        """Fetch and remove all pending notifications for a chat in one statement."""
+        async with self.writer() as db:
+            cursor = await db.execute(
+                """DELETE FROM pending_notifications
+                   WHERE chat_id = ?
+                   RETURNING id, message_guid, message_text, event_title, created_at""",
+                (chat_id,)
+            )
+            rows = await cursor.fetchall()
+
+        # RETURNING has no ORDER BY; keep the oldest-first order of the digest
+        rows.sort(key=lambda row: (row[4], row[0]))
+        return [_pending_dict(row) for row in rows]
+
+    async def requeue_pending_notifications(
+        self,
+        chat_id: int,
+        notifications: list[dict]
+    ) -> None:
+        """Put back notifications returned by pop_pending_notifications (e.g. after a failed send)."""
+        async with self.writer() as db:
+            await db.executemany(
+                """INSERT OR IGNORE INTO pending_notifications
+                   (chat_id, message_guid, message_text, event_title, created_at)
+                   VALUES (?, ?, ?, ?, ?)""",
+                [
+                    (chat_id, n["message_guid"], n["message_text"],
+                     n["event_title"], n["created_at"])
+                    for n in notifications
+                ]
+            )
 
     async def clear_pending_notifications(self, chat_id: int) -> int:
         """Clear all pending notifications for a chat."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.writer() as db:
             cursor = await db.execute(
                 "DELETE FROM pending_notifications WHERE chat_id = ?",
                 (chat_id,)
             )
-            await db.commit()
             return cursor.rowcount
 
     # ==================== Statistics ====================
 
     async def get_stats(self) -> dict:
         """Get database statistics."""
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
-                "SELECT COUNT(*) FROM subscribed_chats WHERE is_active = 1"
-            )
-            active_chats = (await cursor.fetchone())[0]
-
-            cursor = await db.execute("SELECT COUNT(*) FROM sent_messages")
-            total_messages = (await cursor.fetchone())[0]
-
-            cursor = await db.execute(
-                "SELECT COUNT(*) FROM sent_messages WHERE delivery_status = 'failed'"
-            )
-            failed_messages = (await cursor.fetchone())[0]
+        async with self.reader() as db:
+            cursor = await db.execute("""
+                SELECT
+                    (SELECT COUNT(*) FROM subscribed_chats WHERE is_active = 1),
+                    (SELECT COUNT(*) FROM sent_messages),
+                    (SELECT COUNT(*) FROM sent_messages WHERE delivery_status = 'failed')
+            """)
+            active_chats, total_messages, failed_messages = await cursor.fetchone()
 
             return {
                 "active_chats": active_chats,
@@ -499,30 +1038,42 @@ class Database:
         Returns:
             Dictionary with backup data and metadata
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            
+        async with self.reader() as db:
             # Export subscribed chats
             cursor = await db.execute(
                 """SELECT chat_id, chat_type, chat_title, subscribed_at,
                           is_active, quiet_hours_start, quiet_hours_end, quiet_hours_tz
                    FROM subscribed_chats"""
             )
-            chats = [dict(row) for row in await cursor.fetchall()]
-            
-            # Get stats
-            stats = await self.get_stats()
-            
-            backup = {
-                "version": "1.0",
-                "exported_at": datetime.now().isoformat(),
-                "stats": stats,
-                "subscribed_chats": chats
-            }
-            
-            logger.info(f"Backup exported: {len(chats)} chats ({stats['active_chats']} active)")
-            
-            return backup
+            chats = []
+            while rows := await cursor.fetchmany(FETCH_BATCH_SIZE):
+                chats.extend(
+                    {
+                        "chat_id": row[0],
+                        "chat_type": row[1],
+                        "chat_title": row[2],
+                        "subscribed_at": row[3],
+                        "is_active": row[4],
+                        "quiet_hours_start": row[5],
+                        "quiet_hours_end": row[6],
+                        "quiet_hours_tz": row[7],
+                    }
+                    for row in rows
+                )
+
+        # Get stats (uses its own reader connection)
+        stats = await self.get_stats()
+
+        backup = {
+            "version": "1.0",
+            "exported_at": datetime.now().isoformat(),
+            "stats": stats,
+            "subscribed_chats": chats
+        }
+
+        logger.info(f"Backup exported: {len(chats)} chats ({stats['active_chats']} active)")
+
+        return backup
 
     async def import_backup(
         self,
@@ -543,59 +1094,27 @@ class Database:
             raise ValueError("Invalid backup format: missing subscribed_chats")
         
         chats = backup_data["subscribed_chats"]
-        imported = 0
-        skipped = 0
+        if not isinstance(chats, list):
+            raise ValueError("Invalid backup format: subscribed_chats must be a list")
+
         errors = 0
-        
-        async with aiosqlite.connect(self.db_path) as db:
-            if not merge:
-                # Clear existing subscriptions
-                await db.execute("DELETE FROM subscribed_chats")
-                await db.commit()
-                logger.warning("Cleared existing subscriptions for restore")
-            
-            for chat in chats:
-                try:
-                    chat_id = chat.get("chat_id")
-                    if not chat_id:
-                        errors += 1
-                        continue
-                    
-                    # Check if exists
-                    cursor = await db.execute(
-                        "SELECT 1 FROM subscribed_chats WHERE chat_id = ?",
-                        (chat_id,)
-                    )
-                    exists = await cursor.fetchone()
-                    
-                    if exists and merge:
-                        skipped += 1
-                        continue
-                    
-                    # Insert or replace
-                    await db.execute(
-                        """INSERT OR REPLACE INTO subscribed_chats
-                           (chat_id, chat_type, chat_title, subscribed_at,
-                            is_active, quiet_hours_start, quiet_hours_end, quiet_hours_tz)
-                           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                        (
-                            chat_id,
-                            chat.get("chat_type", "unknown"),
-                            chat.get("chat_title"),
-                            chat.get("subscribed_at", datetime.now().isoformat()),
-                            chat.get("is_active", 1),
-                            chat.get("quiet_hours_start"),
-                            chat.get("quiet_hours_end"),
-                            chat.get("quiet_hours_tz", "UTC")
-                        )
-                    )
-                    imported += 1
-                    
-                except Exception as e:
-                    logger.error(f"Error importing chat: {e}")
-                    errors += 1
-            
-            await db.commit()
+        now = datetime.now().isoformat()
+
+        # Every row is validated before anything is written: a bad row is
+        # counted as an error instead of failing the insert, and a replace
+        # only clears the table once the whole backup is known to be usable
+        rows = []
+        for chat in chats:
+            try:
+                if not isinstance(chat, dict):
+                    raise ValueError("chat entry must be an object")
+                rows.append(_backup_row(chat, now))
+            except ValueError as e:
+                errors += 1
+                logger.warning(f"Skipping invalid chat in backup: {e}")
+
+        imported = await self.restore_chats_batch(rows, merge=merge)
+        skipped = len(rows) - imported
         
         result = {
             "imported": imported,
@@ -606,3 +1125,44 @@ class Database:
         
         logger.info(f"Backup imported: {imported} imported, {skipped} skipped, {errors} errors")
         return result
+
+    async def restore_chats_batch(
+        self,
+        rows: list[tuple],
+        merge: bool = True
+    ) -> int:
+        """
+        Write backup rows with executemany, IMPORT_BATCH_SIZE rows per
+        transaction so a large restore does not hold the writer for long.
+
+        Args:
+            rows: Validated tuples (see _backup_row) of (chat_id, chat_type,
+                  chat_title, subscribed_at, is_active, quiet_hours_start,
+                  quiet_hours_end, quiet_hours_tz)
+            merge: If True, existing chats are kept. If False, replace all.
+
+        Returns:
+            Number of chats written
+        """
+        conflict = "IGNORE" if merge else "REPLACE"
+        sql = f"""INSERT OR {conflict} INTO subscribed_chats
+                  (chat_id, chat_type, chat_title, subscribed_at,
+                   is_active, quiet_hours_start, quiet_hours_end, quiet_hours_tz)
+                  VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
+        written = 0
+
+        # At least one pass, so a replace with no rows still clears the table
+        for start in range(0, max(len(rows), 1), IMPORT_BATCH_SIZE):
+            batch = rows[start:start + IMPORT_BATCH_SIZE]
+
+            async with self._chat_writer() as db:
+                if not merge and start == 0:
+                    # Clear existing subscriptions (together with the first batch)
+                    await db.execute("DELETE FROM subscribed_chats")
+                    logger.warning("Cleared existing subscriptions for restore")
+
+                if batch:
+                    cursor = await db.executemany(sql, batch)
+                    written += max(cursor.rowcount, 0)
+
+        return written
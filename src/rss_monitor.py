@@ -3,9 +3,19 @@ RSS Monitor module for IX.br Status Bot.
 Handles fetching and parsing the IX.br status RSS feed with retry logic.
 """
 
+import asyncio
+import calendar
 import hashlib
-from dataclasses import dataclass
+import logging
+import re
+import xml.etree.ElementTree as ET
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_tz
+from functools import lru_cache
+from time import gmtime, monotonic
 from typing import Optional
 from enum import Enum
 from io import BytesIO
@@ -17,7 +27,8 @@ from tenacity import (
     retry,
     stop_after_attempt,
     wait_exponential,
-    retry_if_exception_type,
+    wait_random,
+    retry_if_exception,
     before_sleep_log
 )
 
@@ -26,6 +37,146 @@ from .config import config, logger
 # Timeout for HTTP requests (seconds)
 HTTP_TIMEOUT = 30
 
+# Feed fetch attempts per poll; waits grow 4s, 8s (capped at 16s) plus up to
+# 2s of random jitter so restarted instances do not retry in lockstep
+FETCH_ATTEMPTS = 3
+
+# Connection pool of the shared HTTP client (a single feed host)
+HTTP_LIMITS = httpx.Limits(max_connections=10, max_keepalive_connections=5)
+
+# Descriptions longer than this are truncated in Telegram messages
+MAX_DESCRIPTION_LENGTH = 800
+
+# Read size when streaming the feed body (bytes)
+FETCH_CHUNK_SIZE = 65536
+
+# Larger feed bodies are rejected while streaming (bytes, after decompression)
+MAX_FEED_BYTES = 8 * 1024 * 1024
+
+# Parsed events remembered by GUID, so unchanged entries are not re-parsed
+SEEN_GUIDS_MAX = 4096
+
+# Events and feed entries from a successful fetch are reused for this long
+# (seconds) by fetch_events and check_feed_status instead of fetching again
+FETCH_CACHE_TTL = 5.0
+
+# Entries are cleaned and classified in batches, joined by this separator
+# (never present in XML text, not matched by the patterns below)
+_BATCH_SEP = "\x00"
+
+# Description cleanup: HTML tags, whitespace runs and footer separators.
+# A tag never spans a batch separator.
+_HTML_TAG_RE = re.compile(r"<[^>\x00]+>")
+_WS_RE = re.compile(r"\s+")
+_SEPARATORS = ("+++++", "-----", "=====", "*****")
+
+# Classification keywords (matched against lowercased title + description)
+_RESOLVED_KW = (
+    "resolvid", "solved", "restored",
+    "restabelecid", "normalizado", "normalized"
+)
+_MAINT_KW = (
+    "manutencao", "maintenance", "janela",
+    "window", "programad", "scheduled"
+)
+_INCIDENT_KW = (
+    "indisponibilidade", "unavailability", "problema",
+    "problem", "incident", "incidente", "falha",
+    "failure", "rompimento", "disruption"
+)
+
+# Characters escaped for Telegram HTML, applied in a single pass
+_HTML_ESCAPE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+})
+
+# Location in a title: the text after "IX.br", up to the first spaced
+# separator (" - ", " – ", " — "), the next "IX.br" or the end
+_LOCATION_RE = re.compile(r"IX\.br\s*(.*?)(?= [-–—] |IX\.br|\Z)", re.S)
+
+
+# Content hashes and generated GUIDs are stored in sent_messages, so the
+# algorithm is part of the on-disk format: changing it would make every
+# stored event look edited (or new) once. SHA-256 is also hardware
+# accelerated on current CPUs and costs well under a microsecond here.
+def _short_digest(text: str, length: int) -> str:
+    """SHA-256 hex digest of text, truncated to length characters (stored on disk)."""
+    return hashlib.sha256(text.encode()).hexdigest()[:length]
+
+
+# Date fields pre-parsed into a UTC struct_time, in order of preference
+_PARSED_DATE_FIELDS = ("published_parsed", "updated_parsed", "created_parsed")
+
+
+@lru_cache(maxsize=1024)
+def _parse_date_str(date_str: str) -> Optional[datetime]:
+    """Parse a raw feed date with dateutil (slow path, cached per string)."""
+    try:
+        parsed = date_parser.parse(date_str)
+    except (ValueError, OverflowError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+# RSS 2.0 <item> children read by the built-in reader, mapped to the
+# feedparser entry keys used by the rest of the module
+_RSS_ITEM_FIELDS = {
+    "title": "title",
+    "description": "description",
+    "link": "link",
+    "guid": "id",
+    "pubDate": "published",
+}
+
+
+def _read_rss(body: bytes) -> Optional[list[dict]]:
+    """
+    Read the items of an RSS 2.0 document with ElementTree.iterparse,
+    keeping only the fields the monitor uses.
+
+    Returns:
+        Entries as dicts with feedparser's keys, or None if the document
+        is not RSS 2.0 (e.g. Atom)
+
+    Raises:
+        ET.ParseError: If the XML is malformed
+    """
+    entries = []
+    parser = ET.iterparse(BytesIO(body), events=("end",))
+
+    for _, elem in parser:
+        if elem.tag != "item":
+            continue
+
+        entry = {}
+        for child in elem:
+            key = _RSS_ITEM_FIELDS.get(child.tag)
+            if key:
+                entry[key] = "".join(child.itertext()).strip()
+
+        # RFC 822 dates are converted here; anything else is left to dateutil
+        date_tuple = parsedate_tz(entry.get("published", ""))
+        if date_tuple:
+            try:
+                entry["published_parsed"] = gmtime(
+                    calendar.timegm(date_tuple[:9]) - (date_tuple[9] or 0)
+                )
+            except (OverflowError, ValueError, OSError):
+                pass
+
+        entries.append(entry)
+        # Drop the item's subtree once read
+        elem.clear()
+
+    if parser.root.tag != "rss":
+        return None
+    return entries
+
 
 class EventType(Enum):
     """Types of events from IX.br status page."""
@@ -35,7 +186,35 @@ class EventType(Enum):
     UNKNOWN = "unknown"              # Unclassified events
 
 
-@dataclass
+# Message prefix per event type (every EventType has one)
+_TYPE_LABELS = {
+    EventType.MAINTENANCE: "[MANUTENCAO]",
+    EventType.INCIDENT: "[INCIDENTE]",
+    EventType.RESOLVED: "[RESOLVIDO]",
+    EventType.UNKNOWN: "[AVISO]",
+}
+
+
+# Classification results by priority: a resolved keyword wins over a
+# maintenance one, which wins over an incident one
+_CLASSIFICATIONS = (
+    (EventType.RESOLVED, True),
+    (EventType.MAINTENANCE, False),
+    (EventType.INCIDENT, False),
+)
+_KEYWORD_RANK = {
+    kw: rank
+    for rank, keywords in enumerate((_RESOLVED_KW, _MAINT_KW, _INCIDENT_KW))
+    for kw in keywords
+}
+# Every keyword in one pattern; the lookahead reports overlapping
+# occurrences, so a single scan sees all keywords in the text
+_CLASSIFY_RE = re.compile(
+    "(?=(" + "|".join(map(re.escape, _KEYWORD_RANK)) + "))"
+)
+
+
+@dataclass(slots=True)
 class StatusEvent:
     """Represents a single status event from the RSS feed."""
     guid: str                        # Unique identifier
@@ -46,6 +225,14 @@ class StatusEvent:
     event_type: EventType            # Type of event
     location: Optional[str] = None   # IX.br location (e.g., "Sao Paulo, SP")
     is_resolved: bool = False        # Whether the incident is resolved
+    # Computed on first use; events are reused across polls while the feed
+    # is unchanged and sent to many chats
+    _content_hash: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _message: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def get_content_hash(self) -> str:
         """
@@ -55,8 +242,10 @@ class StatusEvent:
         Returns:
             SHA256 hash of the relevant content fields
         """
-        content = f"{self.title}|{self.description}|{self.event_type.value}"
-        return hashlib.sha256(content.encode()).hexdigest()[:32]
+        if self._content_hash is None:
+            content = f"{self.title}|{self.description}|{self.event_type.value}"
+            self._content_hash = _short_digest(content, 32)
+        return self._content_hash
 
     def to_telegram_message(self) -> str:
         """
@@ -65,55 +254,50 @@ class StatusEvent:
         Returns:
             Formatted message string with HTML formatting
         """
-        # Choose prefix based on event type
-        type_labels = {
-            EventType.MAINTENANCE: "[MANUTENCAO]",
-            EventType.INCIDENT: "[INCIDENTE]",
-            EventType.RESOLVED: "[RESOLVIDO]",
-            EventType.UNKNOWN: "[AVISO]"
-        }
-        type_label = type_labels.get(self.event_type, "[AVISO]")
-
-        # Format the message
-        lines = [
-            f"<b>{type_label}</b>",
-            "",
-            f"<b>{self._escape_html(self.title)}</b>",
-            "",
-        ]
-
-        if self.location:
-            lines.append(f"<b>Local:</b> {self._escape_html(self.location)}")
-            lines.append("")
-
-        if self.description:
-            # Truncate long descriptions
-            desc = self.description
-            if len(desc) > 800:
-                desc = desc[:800] + "..."
-            lines.append(self._escape_html(desc))
-            lines.append("")
-
-        if self.link:
-            lines.append(f"<b>Detalhes:</b> {self.link}")
-            lines.append("")
-
-        # Format publication date in Brazilian format
-        date_str = self.published.strftime("%d/%m/%Y as %H:%M (UTC)")
-        lines.append(f"<i>Postado em: {date_str}</i>")
+        if self._message is None:
+            self._message = self._build_message()
+        return self._message
+
+    def _build_message(self) -> str:
+        """Build the HTML message returned by to_telegram_message."""
+        type_label = _TYPE_LABELS[self.event_type]
+
+        # Truncate long descriptions
+        desc = self.description
+        if len(desc) > MAX_DESCRIPTION_LENGTH:
+            desc = desc[:MAX_DESCRIPTION_LENGTH] + "..."
+
+        location_block = (
+            f"<b>Local:</b> {self._escape_html(self.location)}\n\n"
+            if self.location else ""
+        )
+        desc_block = f"{self._escape_html(desc)}\n\n" if desc else ""
+        link_block = f"<b>Detalhes:</b> {self.link}\n\n" if self.link else ""
 
-        return "\n".join(lines)
+        # Publication date in Brazilian format
+        return (
+            f"<b>{type_label}</b>\n\n"
+            f"<b>{self._escape_html(self.title)}</b>\n\n"
+            f"{location_block}{desc_block}{link_block}"
+            f"<i>Postado em: {self.published:%d/%m/%Y as %H:%M (UTC)}</i>"
+        )
 
     @staticmethod
     def _escape_html(text: str) -> str:
         """Escape HTML special characters for Telegram."""
-        return (
-            text
-            .replace("&", "&amp;")
-            .replace("<", "&lt;")
-            .replace(">", "&gt;")
-            .replace('"', "&quot;")
-        )
+        return text.translate(_HTML_ESCAPE)
+
+
+@dataclass(slots=True)
+class FeedStatus:
+    """Result of a feed health check (see RSSMonitor.check_feed_status)."""
+    reachable: bool = False
+    last_post_date: Optional[datetime] = None
+    last_post_title: Optional[str] = None
+    total_entries: int = 0
+    error: Optional[str] = None
+    last_successful_fetch: Optional[datetime] = None
+    consecutive_failures: int = 0
 
 
 class RSSFetchError(Exception):
@@ -121,6 +305,11 @@ class RSSFetchError(Exception):
     pass
 
 
+class FeedTooLargeError(RSSFetchError):
+    """Feed body larger than MAX_FEED_BYTES (not retried)."""
+    pass
+
+
 class RSSMonitor:
     """Monitors the IX.br RSS feed for status updates."""
 
@@ -133,34 +322,109 @@ class RSSMonitor:
         """
         self.feed_url = feed_url or config.rss_feed_url
         self.max_age_days = config.max_message_age_days
+        self.use_feedparser = config.rss_use_feedparser
         self._last_successful_fetch: Optional[datetime] = None
         self._consecutive_failures = 0
-
-    async def _fetch_feed_async(self) -> feedparser.FeedParserDict:
+        # Validators from the last 200 response, sent back as a conditional GET
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        # Shared client, so polls and status checks reuse a warm (HTTP/2)
+        # connection instead of a new TCP + TLS handshake each time.
+        # Accept-Encoding is left to httpx: it sends "gzip, deflate, br" when
+        # brotli is installed and never offers an encoding it cannot decode.
+        # Closed by aclose().
+        self._client = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT, http2=True, limits=HTTP_LIMITS
+        )
+        # Digest of the last parsed body and the events parsed from it, reused
+        # while the feed is unchanged (HTTP 304 or an identical body)
+        self._last_body_hash: Optional[bytes] = None
+        self._last_events: list[StatusEvent] = []
+        # Last event parsed per GUID, with the raw entry fields it came from
+        # (least recently seen first, capped at SEEN_GUIDS_MAX)
+        self._seen_guids: OrderedDict[str, tuple[tuple, StatusEvent]] = OrderedDict()
+        # Concurrent fetch_events and check_feed_status calls wait for the
+        # fetch in flight and share its result (kept for FETCH_CACHE_TTL)
+        self._fetch_lock = asyncio.Lock()
+        self._cached_events: list[StatusEvent] = []
+        self._cached_at: Optional[float] = None
+        # Raw entries of the current feed, and when they were last confirmed
+        self._feed_entries: list = []
+        self._entries_at: Optional[float] = None
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client."""
+        await self._client.aclose()
+
+    @retry(
+        stop=stop_after_attempt(FETCH_ATTEMPTS),
+        wait=wait_exponential(multiplier=4, min=4, max=16) + wait_random(0, 2),
+        retry=retry_if_exception(
+            lambda e: isinstance(e, RSSFetchError)
+            and not isinstance(e, FeedTooLargeError)
+        ),
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+        reraise=True
+    )
+    async def _fetch_feed_async(self) -> Optional[list]:
         """
         Fetch the RSS feed asynchronously with timeout.
+        Retried with jittered exponential backoff on RSSFetchError, except
+        FeedTooLargeError: an oversized feed is not downloaded again.
 
         Returns:
-            Parsed feed dictionary
+            Parsed feed entries, or None if the feed is unchanged
+            (HTTP 304 or the same body as the last parsed one)
 
         Raises:
             RSSFetchError: If feed fetch fails
         """
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+
         try:
-            async with httpx.AsyncClient(timeout=HTTP_TIMEOUT) as client:
-                response = await client.get(self.feed_url)
+            async with self._client.stream(
+                "GET", self.feed_url, headers=headers
+            ) as response:
+                if response.status_code == 304:
+                    # A 304 may carry refreshed validators; keep the old ones otherwise
+                    self._etag = response.headers.get("ETag", self._etag)
+                    self._last_modified = response.headers.get(
+                        "Last-Modified", self._last_modified
+                    )
+                    return None
                 response.raise_for_status()
 
-                # Parse the feed content
-                feed = feedparser.parse(BytesIO(response.content))
+                # Hash the body as it arrives instead of after buffering it
+                digest = hashlib.sha256()
+                body = await self._read_body(response, digest)
 
-                # Check for parsing errors with no entries
-                if feed.bozo and not feed.entries:
-                    raise RSSFetchError(
-                        f"Feed parsing error: {feed.bozo_exception}"
-                    )
+                # Only a fully read body may be revalidated with a 304 later
+                self._etag = response.headers.get("ETag")
+                self._last_modified = response.headers.get("Last-Modified")
+
+            # Servers without validators still tend to serve identical bodies
+            body_hash = digest.digest()
+            if body_hash == self._last_body_hash:
+                return None
 
-                return feed
+            # Parse the feed content in a worker thread so a large feed
+            # does not block the event loop
+            loop = asyncio.get_running_loop()
+            try:
+                entries = await loop.run_in_executor(
+                    None, self._parse_body, body
+                )
+            except RSSFetchError:
+                # Do not let a 304 skip the next attempt
+                self._etag = self._last_modified = None
+                raise
+
+            self._last_body_hash = body_hash
+            return entries
 
         except httpx.HTTPStatusError as e:
             raise RSSFetchError(f"HTTP error {e.response.status_code}")
@@ -173,149 +437,307 @@ class RSSMonitor:
         except Exception as e:
             raise RSSFetchError(f"Failed to fetch RSS feed: {e}")
 
-    def _fetch_feed_sync(self) -> feedparser.FeedParserDict:
+    async def _fetch_feed_full(self) -> list:
         """
-        Fetch the RSS feed synchronously (for check_feed_status).
-        Uses timeout via httpx.
+        Fetch and parse the whole feed once, without validators or retries
+        (for check_feed_status).
 
         Returns:
-            Parsed feed dictionary
+            Parsed feed entries
         """
         try:
-            with httpx.Client(timeout=HTTP_TIMEOUT) as client:
-                response = client.get(self.feed_url)
+            async with self._client.stream("GET", self.feed_url) as response:
                 response.raise_for_status()
-                return feedparser.parse(BytesIO(response.content))
+                body = await self._read_body(response)
+
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._parse_body, body)
+        except RSSFetchError:
+            raise
         except Exception as e:
             raise RSSFetchError(f"Failed to fetch RSS feed: {e}")
 
+    @staticmethod
+    async def _read_body(
+        response: httpx.Response,
+        digest: Optional["hashlib._Hash"] = None
+    ) -> bytes:
+        """
+        Read a streamed response body, giving up as soon as it grows past
+        MAX_FEED_BYTES instead of buffering it whole.
+
+        Args:
+            response: Response opened with client.stream()
+            digest: Optional hash object updated with each chunk
+
+        Raises:
+            FeedTooLargeError: If the body is larger than MAX_FEED_BYTES
+        """
+        declared = response.headers.get("Content-Length", "")
+        if declared.isdigit() and int(declared) > MAX_FEED_BYTES:
+            raise FeedTooLargeError(
+                f"Feed too large: {declared} bytes (limit: {MAX_FEED_BYTES})"
+            )
+
+        chunks = []
+        size = 0
+        async for chunk in response.aiter_bytes(FETCH_CHUNK_SIZE):
+            size += len(chunk)
+            if size > MAX_FEED_BYTES:
+                raise FeedTooLargeError(
+                    f"Feed too large: over {MAX_FEED_BYTES} bytes"
+                )
+            if digest is not None:
+                digest.update(chunk)
+            chunks.append(chunk)
+
+        return b"".join(chunks)
+
+    def _parse_body(self, body: bytes) -> list:
+        """
+        Parse a feed body into entries (runs in a worker thread).
+
+        The built-in RSS reader is used unless RSS_USE_FEEDPARSER is set;
+        documents it cannot read (not RSS 2.0, or malformed XML that
+        feedparser may still recover) go to feedparser.
+
+        Raises:
+            RSSFetchError: If the feed cannot be parsed
+        """
+        if not self.use_feedparser:
+            try:
+                entries = _read_rss(body)
+                if entries is not None:
+                    return entries
+            except ET.ParseError as e:
+                logger.debug(f"RSS reader failed, falling back to feedparser: {e}")
+
+        feed = feedparser.parse(BytesIO(body))
+        if feed.bozo and not feed.entries:
+            raise RSSFetchError(f"Feed parsing error: {feed.bozo_exception}")
+        return feed.entries
+
     async def fetch_events(self) -> list[StatusEvent]:
         """
         Fetch and parse events from the RSS feed asynchronously.
 
-        Retries up to 3 times with exponential backoff.
+        Retries up to FETCH_ATTEMPTS times with jittered exponential backoff.
+        Only one fetch runs at a time: concurrent callers wait for it, and a
+        successful result is reused for FETCH_CACHE_TTL seconds.
 
         Returns:
             List of StatusEvent objects, filtered by age.
             Returns empty list if fetch fails after retries.
         """
+        async with self._fetch_lock:
+            if (
+                self._cached_at is not None and
+                monotonic() - self._cached_at < FETCH_CACHE_TTL
+            ):
+                logger.debug("RSS feed fetched moments ago, reusing events")
+                return list(self._cached_events)
+
+            events = await self._fetch_events()
+            if events is None:
+                return []
+
+            self._cached_events = events
+            self._cached_at = monotonic()
+            return list(events)
+
+    async def _fetch_events(self) -> Optional[list[StatusEvent]]:
+        """
+        Fetch the feed and build the events (see fetch_events).
+
+        Returns:
+            List of StatusEvent objects, or None if the fetch failed
+        """
         logger.debug(f"Fetching RSS feed: {self.feed_url}")
 
-        # Retry logic
-        last_error = None
-        for attempt in range(3):
-            try:
-                feed = await self._fetch_feed_async()
+        try:
+            entries = await self._fetch_feed_async()
+        except RSSFetchError as e:
+            # All retries failed (an oversized feed is not retried)
+            self._consecutive_failures += 1
+            last_success = self._last_successful_fetch.isoformat() if self._last_successful_fetch else "never"
+            if isinstance(e, FeedTooLargeError):
+                logger.error(f"RSS feed rejected, exceeds MAX_FEED_BYTES ({MAX_FEED_BYTES}): {e} (failures: {self._consecutive_failures}, last_success: {last_success})")
+            else:
+                logger.error(f"RSS fetch failed after {FETCH_ATTEMPTS} attempts: {e} (failures: {self._consecutive_failures}, last_success: {last_success})")
+            return None
 
-                # Reset failure counter on success
-                self._consecutive_failures = 0
-                self._last_successful_fetch = datetime.now(timezone.utc)
+        # Reset failure counter on success
+        self._consecutive_failures = 0
+        self._last_successful_fetch = datetime.now(timezone.utc)
 
-                events = []
-                cutoff_date = datetime.now(timezone.utc) - timedelta(
-                    days=self.max_age_days
-                )
+        # A 304 (or identical body) confirms the entries parsed last time
+        if entries is not None:
+            self._feed_entries = entries
+        self._entries_at = monotonic()
 
-                for entry in feed.entries:
-                    event = self._parse_entry(entry)
+        cutoff_date = datetime.now(timezone.utc) - timedelta(
+            days=self.max_age_days
+        )
+
+        if entries is None:
+            logger.debug("RSS feed not modified, reusing parsed events")
+            return [
+                event for event in self._last_events
+                if event.published >= cutoff_date
+            ]
 
-                    if event and event.published >= cutoff_date:
-                        events.append(event)
-                    elif event:
-                        logger.debug(f"Skipping old event: {event.title[:50]}")
+        recent = []
+        dates = []
+
+        for entry in entries:
+            # Dates are cheap to read; old entries skip cleanup and
+            # classification entirely (feed order is not relied upon)
+            published = self._parse_date(entry)
+            if published < cutoff_date:
+                logger.debug(f"Skipping old event: {entry.get('title', '')[:50]}")
+                continue
 
-                logger.info(f"RSS feed fetched: {len(events)} new events (total: {len(feed.entries)})")
+            recent.append(entry)
+            dates.append(published)
 
-                return events
+        events = self._parse_entries(recent, dates)
 
-            except RSSFetchError as e:
-                last_error = e
-                wait_time = 4 * (2 ** attempt)  # 4, 8, 16 seconds
-                logger.warning(f"RSS fetch failed (attempt {attempt + 1}/3): {e} - retry in {wait_time}s")
-                if attempt < 2:  # Don't sleep after last attempt
-                    import asyncio
-                    await asyncio.sleep(wait_time)
+        # Entries only get older, so the filtered list is enough to reuse
+        self._last_events = events
 
-        # All retries failed
-        self._consecutive_failures += 1
-        last_success = self._last_successful_fetch.isoformat() if self._last_successful_fetch else "never"
-        logger.error(f"RSS fetch failed after 3 retries: {last_error} (failures: {self._consecutive_failures}, last_success: {last_success})")
-        return []
+        logger.info(f"RSS feed fetched: {len(events)} new events (total: {len(entries)})")
 
-    def check_feed_status(self) -> dict:
+        return events
+
+    async def check_feed_status(self) -> FeedStatus:
         """
         Check the status of the RSS feed.
-        Uses synchronous request with timeout.
+        Uses the shared async client, so a slow feed does not block the bot,
+        and reuses a fetch made in the last FETCH_CACHE_TTL seconds.
 
         Returns:
-            Dictionary with feed status information
+            FeedStatus with feed status information
         """
-        result = {
-            "reachable": False,
-            "last_post_date": None,
-            "last_post_title": None,
-            "total_entries": 0,
-            "error": None,
-            "last_successful_fetch": self._last_successful_fetch,
-            "consecutive_failures": self._consecutive_failures
-        }
+        result = FeedStatus(
+            last_successful_fetch=self._last_successful_fetch,
+            consecutive_failures=self._consecutive_failures
+        )
 
         try:
-            feed = self._fetch_feed_sync()
+            entries = await self._current_entries()
 
-            if feed.bozo and not feed.entries:
-                result["error"] = str(feed.bozo_exception)
-                return result
+            result.reachable = True
+            result.total_entries = len(entries)
 
-            result["reachable"] = True
-            result["total_entries"] = len(feed.entries)
-
-            if feed.entries:
-                latest_entry = feed.entries[0]
-                result["last_post_title"] = latest_entry.get("title", "Sem titulo")
-                result["last_post_date"] = self._parse_date(latest_entry)
+            if entries:
+                latest_entry = entries[0]
+                result.last_post_title = latest_entry.get("title", "Sem titulo")
+                result.last_post_date = self._parse_date(latest_entry)
 
             return result
 
-        except RSSFetchError as e:
-            result["error"] = str(e)
-            return result
-        except Exception as e:
-            result["error"] = str(e)
+        except (RSSFetchError, httpx.HTTPError) as e:
+            result.error = str(e)
             return result
 
-    def _parse_entry(self, entry: dict) -> Optional[StatusEvent]:
-        """Parse a single RSS entry into a StatusEvent."""
-        try:
-            title = entry.get("title", "Sem titulo")
-            description = entry.get("description", entry.get("summary", ""))
-            link = entry.get("link", "")
+    async def _current_entries(self) -> list:
+        """
+        Feed entries for check_feed_status: the ones from a fetch in the last
+        FETCH_CACHE_TTL seconds, or a new full fetch. Runs under the fetch
+        lock, so concurrent checks share a single download and parse.
+        """
+        async with self._fetch_lock:
+            if (
+                self._entries_at is not None and
+                monotonic() - self._entries_at < FETCH_CACHE_TTL
+            ):
+                return self._feed_entries
+
+            entries = await self._fetch_feed_full()
+            self._feed_entries = entries
+            self._entries_at = monotonic()
+            return entries
+
+    def _parse_entries(
+        self,
+        entries: list,
+        dates: list[datetime]
+    ) -> list[StatusEvent]:
+        """
+        Parse RSS entries (with their already parsed dates) into StatusEvents.
+        An entry seen unchanged in an earlier poll reuses its event; the rest
+        have their descriptions cleaned and events classified as one batch,
+        instead of running the regexes entry by entry.
+        """
+        results: list[Optional[StatusEvent]] = []
+        pending = []
+
+        for entry, published in zip(entries, dates):
             guid = entry.get("id", entry.get("guid", ""))
+            fields = (
+                entry.get("title", "Sem titulo"),
+                entry.get("description", entry.get("summary", "")),
+                entry.get("link", ""),
+                published,
+            )
+            seen = self._seen_guids.get(guid) if guid else None
+            if seen is not None and seen[0] == fields:
+                self._seen_guids.move_to_end(guid)
+                results.append(seen[1])
+            else:
+                pending.append((len(results), guid, fields))
+                results.append(None)
+
+        titles = [fields[0] for _, _, fields in pending]
+        raw_descriptions = [fields[1] for _, _, fields in pending]
+
+        descriptions = self._clean_descriptions(raw_descriptions)
+        classifications = self._classify_events(titles, raw_descriptions)
+
+        for (index, guid, fields), description, classification in zip(
+            pending, descriptions, classifications
+        ):
+            title, raw_description, link, published = fields
+            try:
+                event_type, is_resolved = classification
+                event = StatusEvent(
+                    guid=guid or self._generate_guid(title, raw_description),
+                    title=title,
+                    description=description,
+                    link=link,
+                    published=published,
+                    event_type=event_type,
+                    location=self._extract_location(title),
+                    is_resolved=is_resolved
+                )
 
-            if not guid:
-                guid = self._generate_guid(title, description)
+            except Exception as e:
+                logger.error(f"Failed to parse RSS entry: {e}")
+                continue
 
-            published = self._parse_date(entry)
-            event_type, is_resolved = self._classify_event(title, description)
-            location = self._extract_location(title)
-
-            return StatusEvent(
-                guid=guid,
-                title=title,
-                description=self._clean_description(description),
-                link=link,
-                published=published,
-                event_type=event_type,
-                location=location,
-                is_resolved=is_resolved
-            )
+            results[index] = event
+            if guid:
+                self._seen_guids[guid] = (fields, event)
+                self._seen_guids.move_to_end(guid)
 
-        except Exception as e:
-            logger.error(f"Failed to parse RSS entry: {e}")
-            return None
+        while len(self._seen_guids) > SEEN_GUIDS_MAX:
+            self._seen_guids.popitem(last=False)
+
+        return [event for event in results if event is not None]
 
     def _parse_date(self, entry: dict) -> datetime:
         """Parse the publication date from an RSS entry."""
+        # The reader (or feedparser) usually parsed it into a UTC struct_time
+        for date_field in _PARSED_DATE_FIELDS:
+            value = entry.get(date_field)
+            if value:
+                try:
+                    return datetime.fromtimestamp(
+                        calendar.timegm(value), tz=timezone.utc
+                    )
+                except (OverflowError, ValueError, OSError):
+                    pass
+
         date_str = (
             entry.get("published") or
             entry.get("updated") or
@@ -323,86 +745,71 @@ class RSSMonitor:
         )
 
         if date_str:
-            try:
-                parsed = date_parser.parse(date_str)
-                if parsed.tzinfo is None:
-                    parsed = parsed.replace(tzinfo=timezone.utc)
+            parsed = _parse_date_str(date_str)
+            if parsed is not None:
                 return parsed
-            except Exception:
-                pass
-
-        for field in ["published_parsed", "updated_parsed", "created_parsed"]:
-            if entry.get(field):
-                try:
-                    from time import mktime
-                    timestamp = mktime(entry[field])
-                    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
-                except Exception:
-                    pass
 
         logger.warning("Could not parse date for entry, using current time")
         return datetime.now(timezone.utc)
 
-    def _classify_event(
+    def _classify_events(
         self,
-        title: str,
-        description: str
-    ) -> tuple[EventType, bool]:
-        """Classify the event type based on title and description."""
-        text = f"{title} {description}".lower()
-
-        resolved_keywords = [
-            "resolvid", "solved", "restored",
-            "restabelecid", "normalizado", "normalized"
-        ]
-        is_resolved = any(kw in text for kw in resolved_keywords)
-
-        if is_resolved:
-            return EventType.RESOLVED, True
-
-        maintenance_keywords = [
-            "manutencao", "maintenance", "janela",
-            "window", "programad", "scheduled"
-        ]
-        if any(kw in text for kw in maintenance_keywords):
-            return EventType.MAINTENANCE, False
-
-        incident_keywords = [
-            "indisponibilidade", "unavailability", "problema",
-            "problem", "incident", "incidente", "falha",
-            "failure", "rompimento", "disruption"
+        titles: list[str],
+        descriptions: list[str]
+    ) -> list[tuple[EventType, bool]]:
+        """
+        Classify events based on title and description, with one keyword
+        scan over all of them; each match is mapped back to its entry by
+        offset.
+        """
+        texts = [f"{title} {description}".lower() for title, description in zip(titles, descriptions)]
+
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + len(_BATCH_SEP)
+
+        best = [len(_CLASSIFICATIONS)] * len(texts)
+        for match in _CLASSIFY_RE.finditer(_BATCH_SEP.join(texts)):
+            index = bisect_right(starts, match.start()) - 1
+            best[index] = min(best[index], _KEYWORD_RANK[match.group(1)])
+
+        return [
+            _CLASSIFICATIONS[rank] if rank < len(_CLASSIFICATIONS)
+            else (EventType.UNKNOWN, False)
+            for rank in best
         ]
-        if any(kw in text for kw in incident_keywords):
-            return EventType.INCIDENT, False
-
-        return EventType.UNKNOWN, False
 
     def _extract_location(self, title: str) -> Optional[str]:
         """Extract the IX.br location from the event title."""
-        if "IX.br" in title:
-            parts = title.split("IX.br")
-            if len(parts) > 1:
-                location = parts[1].strip()
-                for sep in [" - ", " – ", " — "]:
-                    if sep in location:
-                        location = location.split(sep)[0].strip()
-                return location if location else None
-        return None
+        match = _LOCATION_RE.search(title)
+        if match is None:
+            return None
+        return match.group(1).strip() or None
 
-    def _clean_description(self, description: str) -> str:
-        """Clean HTML tags and extra whitespace from description."""
-        import re
+    def _clean_descriptions(self, descriptions: list[str]) -> list[str]:
+        """
+        Clean HTML tags and extra whitespace from descriptions, with one
+        substitution pass per pattern over the whole batch.
+        """
+        if not descriptions:
+            return []
 
-        text = re.sub(r"<[^>]+>", "", description)
-        text = re.sub(r"\s+", " ", text).strip()
+        joined = _HTML_TAG_RE.sub("", _BATCH_SEP.join(descriptions))
+        joined = _WS_RE.sub(" ", joined)
 
-        for sep in ["+++++", "-----", "=====", "*****"]:
-            if sep in text:
-                text = text.split(sep)[0].strip()
+        cleaned = []
+        for text in joined.split(_BATCH_SEP):
+            text = text.strip()
+            for sep in _SEPARATORS:
+                if sep in text:
+                    text = text.split(sep)[0].strip()
+            cleaned.append(text)
 
-        return text
+        return cleaned
 
     def _generate_guid(self, title: str, description: str) -> str:
         """Generate a unique identifier for an entry without a GUID."""
         content = f"{title}|{description}"
-        return hashlib.sha256(content.encode()).hexdigest()[:16]
+        return _short_digest(content, 16)
@@ -0,0 +1,79 @@
+"""
+Tests for the RSS monitor feed size limit.
+Run from the repository root with: python -m unittest
+"""
+
+import os
+import unittest
+from unittest import mock
+
+import httpx
+
+# Settings are validated on import; tests never talk to Telegram
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "123456789:test-token")
+
+from src import rss_monitor  # noqa: E402
+from src.rss_monitor import FeedTooLargeError, RSSMonitor  # noqa: E402
+
+# Feed limit used by the tests (bytes)
+TEST_MAX_FEED_BYTES = 1024
+
+
+class FeedSizeLimitTests(unittest.IsolatedAsyncioTestCase):
+    """An oversized feed fails once, without retries."""
+
+    async def asyncSetUp(self) -> None:
+        self.requests = 0
+        self.monitor = RSSMonitor("http://feed.test/rss")
+        await self.monitor.aclose()
+
+        patcher = mock.patch.object(
+            rss_monitor, "MAX_FEED_BYTES", TEST_MAX_FEED_BYTES
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self) -> None:
+        await self.monitor.aclose()
+
+    def _serve(self, response_factory) -> None:
+        """Route the monitor's client to a handler counting requests."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests += 1
+            return response_factory()
+
+        self.monitor._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+
+    async def test_declared_length_over_limit_is_not_retried(self) -> None:
+        body = b"x" * (TEST_MAX_FEED_BYTES + 1)
+        self._serve(lambda: httpx.Response(200, content=body))
+
+        with self.assertRaises(FeedTooLargeError):
+            await self.monitor._fetch_feed_async()
+        self.assertEqual(self.requests, 1)
+
+    async def test_streamed_body_over_limit_is_not_retried(self) -> None:
+        async def chunks():
+            for _ in range(4):
+                yield b"x" * (TEST_MAX_FEED_BYTES // 2)
+
+        # No Content-Length: the limit is enforced while streaming
+        self._serve(lambda: httpx.Response(200, content=chunks()))
+
+        with self.assertRaises(FeedTooLargeError):
+            await self.monitor._fetch_feed_async()
+        self.assertEqual(self.requests, 1)
+
+    async def test_fetch_events_counts_one_failure(self) -> None:
+        body = b"x" * (TEST_MAX_FEED_BYTES + 1)
+        self._serve(lambda: httpx.Response(200, content=body))
+
+        self.assertEqual(await self.monitor.fetch_events(), [])
+        self.assertEqual(self.requests, 1)
+        self.assertEqual(self.monitor._consecutive_failures, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()